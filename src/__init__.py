@@ -5,11 +5,76 @@ Stock Daily Data Download System for A-Share Market
 主要模块：
 - config_manager: 配置管理器
 - database_manager: 数据库管理器
-- tushare_api_manager: Tushare API管理器
-- download_scheduler: 下载调度器
-- data_processor: 数据处理器
-- stock_info_manager: 股票信息管理器
+- optimized_tushare_api_manager: Tushare API管理器
+- schedule_manager: 调度管理器
+- daily_data_manager: 日线数据管理器
+- stock_basic_manager: 股票基本信息管理器
+
+公开的管理器类在首次访问时才导入对应子模块（PEP 562），
+因此 ``import src`` 不会加载 tushare、pandas 等重量级依赖。
 """
 
-__version__ = "1.0.0"
-__author__ = "Stock Data System" 
\ No newline at end of file
+import importlib
+
+__version__ = "1.0.0"  # 唯一的版本号来源，pyproject.toml 通过 dynamic 读取
+__author__ = "Stock Data System"
+
+# 包内全部子模块，作为运行时枚举子系统的唯一来源（无需 pkgutil 扫描目录）
+_SUBMODULES = (
+    "cli_choices",
+    "cli_handlers",
+    "command_line_interface",
+    "config_manager",
+    "daily_data_manager",
+    "data_integrity_manager",
+    "data_storage_manager",
+    "database_manager",
+    "database_schema_validator",
+    "download_status_manager",
+    "error_handler_retry_manager",
+    "incremental_update_manager",
+    "json_utils",
+    "logging_manager",
+    "monitoring_report_manager",
+    "optimized_tushare_api_manager",
+    "schedule_manager",
+    "smart_download_manager",
+    "stock_basic_manager",
+    "tushare_api_manager",
+)
+
+# 公开名称 -> 所在子模块
+_LAZY_IMPORTS = {
+    "ConfigManager": "config_manager",
+    "DatabaseManager": "database_manager",
+    "OptimizedTushareAPIManager": "optimized_tushare_api_manager",
+    "ScheduleManager": "schedule_manager",
+    "DailyDataManager": "daily_data_manager",
+    "StockBasicManager": "stock_basic_manager",
+}
+
+__all__ = list(_LAZY_IMPORTS) + ["available_modules"]
+
+
+def available_modules() -> tuple:
+    """返回包内所有子模块名称"""
+    return _SUBMODULES
+
+
+def __getattr__(name):
+    """按需导入公开的管理器类或子模块"""
+    if name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        submodule = _LAZY_IMPORTS.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+
+    # 缓存到模块命名空间，后续访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,33 @@
+"""
+命令行参数选项常量
+命令行解析器只需要枚举的取值，放在这个不依赖其他模块的文件中，
+避免为了 --help 导入调度、日志等管理器。
+"""
+
+# 与 schedule_manager.TaskType 的取值保持一致
+TASK_TYPES = (
+    'daily_download',
+    'weekly_cleanup',
+    'monthly_report',
+    'integrity_check',
+    'status_update',
+)
+
+# 与 logging_manager.LogType 的取值保持一致
+LOG_TYPES = (
+    'system',
+    'api',
+    'download',
+    'database',
+    'error',
+    'performance',
+)
+
+# 日志级别
+LOG_LEVELS = ('debug', 'info', 'warning', 'error', 'critical')
+
+# 数据下载类型
+DOWNLOAD_TYPES = ('missing_days', 'recent_days', 'priority_stocks')
+
+# 报告类型
+REPORT_TYPES = ('daily', 'weekly', 'monthly', 'custom')
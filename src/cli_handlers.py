@@ -0,0 +1,905 @@
+"""
+命令行命令处理模块
+包含各子命令的处理逻辑及其依赖的管理器，只有在命令行参数解析成功、
+需要真正执行命令时才会被导入
+"""
+
+import argparse
+import sys
+import os
+import time
+import signal
+from typing import Dict, List, Any
+
+from .json_utils import dumps
+
+
+# 状态图标（循环输出时复用同一字符串对象）
+_ICON_OK = '✅'
+_ICON_FAIL = '❌'
+_ICON_WARN = '⚠️'
+_ICON_PENDING = '⏳'
+
+# 任务状态 -> 图标，未列出的状态显示为进行中
+_STATUS_ICONS = {
+    'completed': _ICON_OK,
+    'failed': _ICON_FAIL,
+}
+
+# 日志级别 -> 图标
+_LEVEL_ICONS = {
+    'info': 'ℹ️',
+    'warning': '⚠️',
+    'error': '❌',
+    'critical': '🚨',
+    'debug': '🐛'
+}
+
+# 报告类型 -> 默认回溯天数（daily 从 end_date 当天开始，未列出的类型回溯1天）
+_REPORT_LOOKBACK_DAYS = {
+    'weekly': 7,
+    'monthly': 30,
+}
+
+
+def _write_lines(lines: List[str]):
+    """一次性写出多行文本，避免逐行 print 在行缓冲 stdout 上的多次系统调用"""
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+
+def _size_mb(db_info: Dict[str, Any]) -> float:
+    """从 get_database_info() 的结果中取数据库文件大小（MB）"""
+    return db_info.get('db_size', 0) / 1024 / 1024
+
+
+def _save_json(data: Dict[str, Any], file_path: str):
+    """将报告保存为JSON文件"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(dumps(data))
+
+
+class _ManagerProperty:
+    """管理器属性描述符，首次访问时才创建对应的管理器"""
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance._get_manager(self.name)
+
+
+class CommandHandlers:
+    """命令处理器类"""
+    
+    # 实例不带 __dict__；管理器由下方的类级描述符提供，不能再列入 __slots__
+    __slots__ = ('config_file', 'verbose', 'quiet', 'dry_run', '_manager_cache')
+    
+    # 管理器按需创建，命令只为实际用到的管理器付出初始化开销
+    config_manager = _ManagerProperty()
+    schedule_manager = _ManagerProperty()
+    db_manager = _ManagerProperty()
+    logging_manager = _ManagerProperty()
+    download_manager = _ManagerProperty()
+    status_manager = _ManagerProperty()
+    integrity_manager = _ManagerProperty()
+    update_manager = _ManagerProperty()
+    stock_manager = _ManagerProperty()
+    daily_manager = _ManagerProperty()
+    api_manager = _ManagerProperty()
+    
+    def __init__(self, args: argparse.Namespace):
+        """
+        初始化命令处理器
+        
+        Args:
+            args: 解析后的命令行参数
+        """
+        self.config_file = args.config
+        self.verbose = args.verbose
+        self.quiet = args.quiet
+        self.dry_run = args.dry_run
+        self._manager_cache: Dict[str, Any] = {}
+    
+    def dispatch(self, args: argparse.Namespace) -> bool:
+        """
+        执行子命令
+        
+        Returns:
+            bool: 是否找到对应的处理方法
+        """
+        handler = getattr(self, f'_handle_{args.command}', None)
+        if handler is None:
+            return False
+        
+        handler(args)
+        return True
+    
+    def shutdown(self):
+        """退出前停止正在运行的调度器（只检查已创建的调度器，不为退出而新建）"""
+        schedule_manager = self._manager_cache.get('schedule_manager')
+        if schedule_manager is not None:
+            from .schedule_manager import ScheduleStatus
+            
+            if schedule_manager.status == ScheduleStatus.RUNNING:
+                schedule_manager.stop_scheduler()
+    
+    def _get_manager(self, name: str) -> Any:
+        """获取管理器实例，首次访问时创建"""
+        manager = self._manager_cache.get(name)
+        if manager is None:
+            manager = self._create_manager(name)
+            self._manager_cache[name] = manager
+        return manager
+    
+    def _create_manager(self, name: str) -> Any:
+        """创建指定的管理器，依赖（pandas、tushare等）在此时才导入"""
+        try:
+            if name == 'config_manager':
+                from .config_manager import ConfigManager
+                manager = ConfigManager(self.config_file)
+            elif name == 'db_manager':
+                from .database_manager import DatabaseManager
+                settings = self.config_manager.get_many({
+                    'database.path': 'data/stock_data.db',
+                    'database.synchronous': 'NORMAL',
+                })
+                manager = DatabaseManager(
+                    settings['database.path'], settings['database.synchronous']
+                )
+            elif name == 'logging_manager':
+                from .logging_manager import LoggingManager
+                manager = LoggingManager(self.config_manager)
+            elif name == 'schedule_manager':
+                from .schedule_manager import ScheduleManager
+                manager = ScheduleManager(self.config_manager)
+            elif name == 'download_manager':
+                from .smart_download_manager import SmartDownloadManager
+                manager = SmartDownloadManager(self.config_manager)
+            elif name == 'status_manager':
+                from .download_status_manager import DownloadStatusManager
+                manager = DownloadStatusManager(self.config_manager)
+            elif name == 'integrity_manager':
+                from .data_integrity_manager import DataIntegrityManager
+                manager = DataIntegrityManager(self.config_manager)
+            elif name == 'update_manager':
+                from .incremental_update_manager import IncrementalUpdateManager
+                manager = IncrementalUpdateManager(self.config_manager)
+            elif name == 'stock_manager':
+                from .stock_basic_manager import StockBasicManager
+                manager = StockBasicManager(self.config_manager)
+            elif name == 'daily_manager':
+                from .daily_data_manager import DailyDataManager
+                manager = DailyDataManager(self.config_manager)
+            elif name == 'api_manager':
+                from .optimized_tushare_api_manager import OptimizedTushareAPIManager
+                manager = OptimizedTushareAPIManager(self.config_manager)
+            else:
+                raise AttributeError(f"未知管理器: {name}")
+            
+            if self.verbose:
+                print(f"[OK] {name} 初始化成功")
+            return manager
+            
+        except Exception as e:
+            print(f"[ERROR] 管理器初始化失败 ({name}): {str(e)}")
+            sys.exit(1)
+    
+    def _handle_init(self, args):
+        """处理初始化命令"""
+        verbose = self.verbose
+        quiet = self.quiet
+        
+        if not quiet:
+            print("[INFO] 初始化系统...")
+        
+        # 创建必要的目录
+        for dir_path in ('data', 'logs', 'config', 'data/backups'):
+            os.makedirs(dir_path, exist_ok=True)
+            if verbose:
+                print(f"[INFO] 创建目录: {dir_path}")
+        
+        # 初始化数据库
+        if self.db_manager.initialize_database():
+            if verbose:
+                print("[OK] 数据库初始化成功")
+        else:
+            print("[ERROR] 数据库初始化失败")
+            return
+        
+        # 初始化配置
+        if args.force:
+            self.config_manager.save()
+            if verbose:
+                print("[INFO] 配置文件重新生成")
+        
+        # 检查API连接
+        try:
+            if self.api_manager.check_connection():
+                if verbose:
+                    print("[OK] API连接测试成功")
+            else:
+                print("[WARN] API连接测试失败，请检查token配置")
+        except Exception as e:
+            print(f"[WARN] API连接测试失败: {str(e)}")
+        
+        if not quiet:
+            print("[OK] 系统初始化完成")
+    
+    def _handle_scheduler(self, args):
+        """处理调度器命令"""
+        if not args.scheduler_action:
+            print("请指定调度器操作")
+            return
+        
+        try:
+            if args.scheduler_action == 'start':
+                if self.dry_run:
+                    print("[DRY-RUN] 启动调度器")
+                    return
+                
+                print("[INFO] 启动调度器...")
+                self.schedule_manager.start_scheduler()
+                print("[OK] 调度器启动成功")
+                
+                if not self.quiet:
+                    print("按 Ctrl+C 停止调度器")
+                    try:
+                        if hasattr(signal, 'pause'):
+                            # 挂起等待信号，不再每秒唤醒；SIGINT/SIGTERM 由 _signal_handler 处理
+                            while True:
+                                signal.pause()
+                        else:
+                            # Windows 没有 signal.pause
+                            while True:
+                                time.sleep(1)
+                    except KeyboardInterrupt:
+                        print("\n[INFO] 停止调度器...")
+                        self.schedule_manager.stop_scheduler()
+                        print("[OK] 调度器已停止")
+            
+            elif args.scheduler_action == 'stop':
+                if self.dry_run:
+                    print("[DRY-RUN] 停止调度器")
+                    return
+                
+                print("[INFO] 停止调度器...")
+                self.schedule_manager.stop_scheduler()
+                print("[OK] 调度器已停止")
+            
+            elif args.scheduler_action == 'pause':
+                if self.dry_run:
+                    print("[DRY-RUN] 暂停调度器")
+                    return
+                
+                print("[INFO] 暂停调度器...")
+                self.schedule_manager.pause_scheduler()
+                print("[OK] 调度器已暂停")
+            
+            elif args.scheduler_action == 'resume':
+                if self.dry_run:
+                    print("[DRY-RUN] 恢复调度器")
+                    return
+                
+                print("[INFO] 恢复调度器...")
+                self.schedule_manager.resume_scheduler()
+                print("[OK] 调度器已恢复")
+            
+            elif args.scheduler_action == 'restart':
+                if self.dry_run:
+                    print("[DRY-RUN] 重启调度器")
+                    return
+                
+                print("[INFO] 重启调度器...")
+                self.schedule_manager.stop_scheduler()
+                time.sleep(2)
+                self.schedule_manager.start_scheduler()
+                print("[OK] 调度器重启成功")
+            
+            elif args.scheduler_action == 'status':
+                status = self.schedule_manager.get_schedule_status()
+                self._print_scheduler_status(status)
+                
+        except Exception as e:
+            print(f"[ERROR] 调度器操作失败: {str(e)}")
+            raise
+    
+    def _handle_task(self, args):
+        """处理任务命令"""
+        if not args.task_action:
+            print("请指定任务操作")
+            return
+        
+        from .schedule_manager import TaskType
+        
+        try:
+            if args.task_action == 'run':
+                task_type = TaskType(args.task_type)
+                
+                if self.dry_run:
+                    print(f"[DRY-RUN] 运行任务: {task_type.value}")
+                    return
+                
+                print(f"[INFO] 运行任务: {task_type.value}")
+                result = self.schedule_manager.run_task_immediately(task_type)
+                print(f"[OK] 任务启动: {result['message']}")
+                
+                if not self.quiet:
+                    # 等待任务完成
+                    print("[INFO] 等待任务完成...")
+                    time.sleep(2)
+                    
+                    # 检查任务状态
+                    task = self.schedule_manager.get_latest_task()
+                    if task:
+                        print(f"[INFO] 任务状态: {task['status']}")
+                        if task['status'] == 'completed':
+                            print("[OK] 任务执行成功")
+                        elif task['status'] == 'failed':
+                            print(f"[ERROR] 任务执行失败: {task['error_message']}")
+            
+            elif args.task_action == 'history':
+                history = self.schedule_manager.get_task_history(args.limit, args.type)
+                self._print_task_history(history)
+            
+            elif args.task_action == 'config':
+                task_type = TaskType(args.task_type)
+                config = {}
+                if args.time:
+                    config['time'] = args.time
+                if args.enabled is not None:
+                    config['enabled'] = args.enabled
+                
+                if config:
+                    if self.dry_run:
+                        print(f"🔄 [预演] 更新任务配置: {task_type.value}")
+                        return
+                    
+                    self.schedule_manager.update_task_config(task_type, config)
+                    print(f"✅ 任务配置已更新: {task_type.value}")
+                else:
+                    # 显示当前配置
+                    status = self.schedule_manager.get_schedule_status()
+                    task_config = status['task_configs'].get(task_type.value)
+                    if task_config:
+                        self._print_task_config(task_type.value, task_config)
+                    else:
+                        print(f"❌ 任务配置不存在: {task_type.value}")
+                        
+        except Exception as e:
+            print(f"❌ 任务操作失败: {str(e)}")
+            raise
+    
+    def _handle_data(self, args):
+        """处理数据命令"""
+        if not args.data_action:
+            print("请指定数据操作")
+            return
+        
+        try:
+            if args.data_action == 'download':
+                if self.dry_run:
+                    print("🔄 [预演] 下载数据")
+                    return
+                
+                print("📥 开始下载数据...")
+                
+                # 创建下载计划
+                download_plan = self.download_manager.create_download_plan(
+                    download_type=args.type,
+                    max_days=args.max_days,
+                    priority_stocks=args.stocks
+                )
+                
+                if self.verbose:
+                    print(f"📋 下载计划: {len(download_plan.get('tasks', []))} 个任务")
+                
+                # 执行下载
+                result = self.download_manager.execute_download_plan(download_plan)
+                
+                if result.get('success'):
+                    print("✅ 数据下载完成")
+                    if self.verbose:
+                        print(f"📊 下载统计: {result.get('statistics', {})}")
+                else:
+                    print("❌ 数据下载失败")
+                    if result.get('error'):
+                        print(f"错误: {result['error']}")
+            
+            elif args.data_action == 'integrity':
+                print("🔍 检查数据完整性...")
+                
+                # 检查完整性
+                report = self.integrity_manager.check_data_integrity()
+                self._print_integrity_report(report)
+                
+                # 修复问题
+                if args.repair and report.get('issues_found', 0) > 0:
+                    if self.dry_run:
+                        print("🔄 [预演] 修复数据问题")
+                        return
+                    
+                    print("🔧 修复数据问题...")
+                    repair_result = self.integrity_manager.repair_data_issues()
+                    if repair_result.get('success'):
+                        print("✅ 数据修复完成")
+                    else:
+                        print("❌ 数据修复失败")
+                
+                # 生成报告
+                if args.report:
+                    from datetime import datetime
+                    
+                    report_file = f"integrity_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                    _save_json(report, report_file)
+                    print(f"📄 报告已保存: {report_file}")
+            
+            elif args.data_action == 'update':
+                if self.dry_run:
+                    print("🔄 [预演] 增量更新")
+                    return
+                
+                print("🔄 增量更新数据...")
+                
+                # 创建更新计划
+                plan = self.update_manager.create_update_plan(
+                    plan_type='recent_days',
+                    days=args.days,
+                    stock_codes=args.stocks
+                )
+                
+                if self.verbose:
+                    print(f"📋 更新计划: {len(plan.get('tasks', []))} 个任务")
+                
+                # 执行更新
+                result = self.update_manager.execute_update_plan(plan)
+                
+                if result.get('success'):
+                    print("✅ 增量更新完成")
+                    if self.verbose:
+                        print(f"📊 更新统计: {result.get('statistics', {})}")
+                else:
+                    print("❌ 增量更新失败")
+                    if result.get('error'):
+                        print(f"错误: {result['error']}")
+                        
+        except Exception as e:
+            print(f"❌ 数据操作失败: {str(e)}")
+            raise
+    
+    def _handle_status(self, args):
+        """处理状态命令"""
+        try:
+            if args.summary:
+                self._print_system_summary()
+            elif args.detailed:
+                self._print_system_detailed()
+            elif args.stocks:
+                self._print_stocks_status(args.stocks)
+            else:
+                self._print_system_status()
+                
+        except Exception as e:
+            print(f"❌ 状态查询失败: {str(e)}")
+            raise
+    
+    def _handle_logs(self, args):
+        """处理日志命令"""
+        try:
+            # 查询日志
+            logs = self.logging_manager.query_logs(
+                log_type=args.type,
+                start_time=args.start_time,
+                end_time=args.end_time,
+                level=args.level,
+                limit=args.limit
+            )
+            
+            # 显示日志
+            self._print_logs(logs)
+            
+            # 导出日志
+            if args.export:
+                if self.dry_run:
+                    print(f"🔄 [预演] 导出日志到: {args.export}")
+                    return
+                
+                result = self.logging_manager.export_logs(
+                    output_file=args.export,
+                    log_type=args.type,
+                    start_time=args.start_time,
+                    end_time=args.end_time
+                )
+                
+                if result.get('success'):
+                    print(f"✅ 日志已导出: {args.export}")
+                else:
+                    print(f"❌ 日志导出失败: {result.get('error')}")
+                    
+        except Exception as e:
+            print(f"❌ 日志查询失败: {str(e)}")
+            raise
+    
+    def _handle_config(self, args):
+        """处理配置命令"""
+        try:
+            if args.config_action == 'get':
+                value = self.config_manager.get(args.key)
+                if value is not None:
+                    print(f"{args.key}: {value}")
+                else:
+                    print(f"❌ 配置项不存在: {args.key}")
+            
+            elif args.config_action == 'set':
+                if self.dry_run:
+                    print(f"🔄 [预演] 设置配置: {args.key} = {args.value}")
+                    return
+                
+                self.config_manager.set(args.key, args.value)
+                print(f"✅ 配置已设置: {args.key} = {args.value}")
+            
+            elif args.config_action == 'list':
+                config_info = self.config_manager.get_config_info()
+                self._print_config_info(config_info)
+            
+            elif args.config_action == 'backup':
+                if self.dry_run:
+                    print("🔄 [预演] 备份配置")
+                    return
+                
+                backup_file = self.config_manager.backup()
+                print(f"✅ 配置已备份: {backup_file}")
+            
+            elif args.config_action == 'validate':
+                is_valid, errors = self.config_manager.validate()
+                if is_valid:
+                    print("✅ 配置验证通过")
+                else:
+                    print("❌ 配置验证失败:")
+                    for error in errors:
+                        print(f"  - {error}")
+                        
+        except Exception as e:
+            print(f"❌ 配置操作失败: {str(e)}")
+            raise
+    
+    def _handle_report(self, args):
+        """处理报告命令"""
+        try:
+            print(f"📊 生成{args.type}报告...")
+            
+            # 生成报告
+            report = self._generate_report(args.type, args.start_date, args.end_date)
+            
+            # 显示报告
+            self._print_report(report)
+            
+            # 保存报告
+            if args.output:
+                if self.dry_run:
+                    print(f"🔄 [预演] 保存报告到: {args.output}")
+                    return
+                
+                _save_json(report, args.output)
+                print(f"✅ 报告已保存: {args.output}")
+                
+        except Exception as e:
+            print(f"❌ 报告生成失败: {str(e)}")
+            raise
+    
+    def _handle_database(self, args):
+        """处理数据库命令"""
+        try:
+            if args.db_action == 'info':
+                info = self.db_manager.get_database_info()
+                self._print_database_info(info)
+            
+            elif args.db_action == 'backup':
+                if self.dry_run:
+                    print("🔄 [预演] 备份数据库")
+                    return
+                
+                backup_file = self.db_manager.backup_database()
+                if backup_file:
+                    print(f"✅ 数据库已备份: {backup_file}")
+                else:
+                    print("❌ 数据库备份失败")
+            
+            elif args.db_action == 'vacuum':
+                if self.dry_run:
+                    print("🔄 [预演] 优化数据库")
+                    return
+                
+                if self.db_manager.vacuum_database():
+                    print("✅ 数据库优化完成")
+                else:
+                    print("❌ 数据库优化失败")
+            
+            elif args.db_action == 'stats':
+                stats = self._get_database_stats()
+                self._print_database_stats(stats)
+            
+            elif args.db_action == 'query':
+                if self.dry_run:
+                    print(f"🔄 [预演] 执行查询: {args.sql}")
+                    return
+                
+                results = self.db_manager.execute_query(args.sql)[:args.limit]
+                self._print_query_results(results)
+                
+        except Exception as e:
+            print(f"❌ 数据库操作失败: {str(e)}")
+            raise
+    
+    def _print_scheduler_status(self, status: Dict[str, Any]):
+        """打印调度器状态"""
+        lines = [
+            f"📋 调度器状态: {status['status']}",
+            f"🔧 任务配置: {len(status['task_configs'])} 个任务",
+        ]
+        
+        for task_type, config in status['task_configs'].items():
+            enabled = _ICON_OK if config.get('enabled', True) else _ICON_FAIL
+            lines.append(f"  {enabled} {task_type}: {config.get('time', 'N/A')}")
+        
+        if status.get('current_task'):
+            lines.append(f"⏳ 当前任务: {status['current_task']}")
+        
+        if status.get('next_run'):
+            lines.append("⏰ 下次运行:")
+            for task, next_time in status['next_run'].items():
+                lines.append(f"  {task}: {next_time}")
+        
+        _write_lines(lines)
+    
+    def _print_task_history(self, history: List[Dict[str, Any]]):
+        """打印任务历史"""
+        if not history:
+            print("📋 暂无任务历史")
+            return
+        
+        lines = [f"📋 任务历史 (最近 {len(history)} 条):"]
+        
+        for task in history:
+            status_icon = _STATUS_ICONS.get(task['status'], _ICON_PENDING)
+            duration = f"{task['execution_time']}s" if task['execution_time'] else "N/A"
+            
+            lines.append(f"  {status_icon} {task['start_time']} - {task['task_type']} ({duration})")
+            if task['error_message']:
+                lines.append(f"    错误: {task['error_message']}")
+        
+        _write_lines(lines)
+    
+    def _print_task_config(self, task_type: str, config: Dict[str, Any]):
+        """打印任务配置"""
+        print(f"📋 任务配置: {task_type}")
+        print(f"  时间: {config.get('time', 'N/A')}")
+        print(f"  启用: {'是' if config.get('enabled', True) else '否'}")
+        print(f"  描述: {config.get('description', 'N/A')}")
+    
+    def _print_integrity_report(self, report: Dict[str, Any]):
+        """打印完整性报告"""
+        lines = [
+            "🔍 数据完整性报告:",
+            f"  检查项目: {len(report)}",
+        ]
+        
+        for check_name, result in report.items():
+            if isinstance(result, dict):
+                issues = result.get('issues_found', 0)
+                status_icon = _ICON_OK if issues == 0 else _ICON_WARN
+                lines.append(f"  {status_icon} {check_name}: {issues} 个问题")
+        
+        _write_lines(lines)
+    
+    def _print_system_summary(self, db_info: Dict[str, Any] = None):
+        """
+        打印系统摘要
+        
+        Args:
+            db_info: 已获取的数据库信息，详细视图传入以免重复查询
+        """
+        print("📊 系统摘要:")
+        
+        # 调度器状态
+        scheduler_status = self.schedule_manager.get_schedule_status()
+        print(f"  调度器: {scheduler_status['status']}")
+        
+        # 下载统计
+        download_stats = self.status_manager.get_download_statistics()
+        print(f"  下载统计: {download_stats}")
+        
+        # 数据库大小
+        if db_info is None:
+            db_info = self.db_manager.get_database_info()
+        print(f"  数据库大小: {_size_mb(db_info):.2f} MB")
+    
+    def _print_system_detailed(self):
+        """打印系统详细信息"""
+        print("📊 系统详细信息:")
+        
+        # 摘要与下方的数据库信息共用一次查询结果
+        db_info = self.db_manager.get_database_info()
+        
+        # 系统摘要
+        self._print_system_summary(db_info)
+        
+        # 配置信息
+        print("\n⚙️ 配置信息:")
+        config_info = self.config_manager.get_config_info()
+        print(f"  配置文件: {config_info.get('file_path')}")
+        print(f"  修改时间: {config_info.get('last_modified')}")
+        
+        # 数据库信息
+        print("\n📊 数据库信息:")
+        print(f"  数据库文件: {db_info.get('db_path')}")
+        print(f"  文件大小: {_size_mb(db_info):.2f} MB")
+        print(f"  表数量: {len(db_info.get('tables', []))}")
+    
+    def _print_stocks_status(self, stocks: List[str]):
+        """打印股票状态"""
+        lines = [f"📊 股票状态: {len(stocks)} 只股票"]
+        
+        for stock_code in stocks:
+            status = self.status_manager.get_stock_status(stock_code)
+            if status:
+                lines.append(f"  {stock_code}: {status.get('status', 'unknown')}")
+            else:
+                lines.append(f"  {stock_code}: 未找到")
+        
+        _write_lines(lines)
+    
+    def _print_system_status(self):
+        """打印系统状态"""
+        print("📊 系统状态:")
+        
+        # 调度器状态
+        scheduler_status = self.schedule_manager.get_schedule_status()
+        print(f"  📋 调度器: {scheduler_status['status']}")
+        
+        # 数据库状态
+        db_info = self.db_manager.get_database_info()
+        print(f"  📊 数据库: {_size_mb(db_info):.2f} MB")
+        
+        # API状态
+        try:
+            api_status = self.api_manager.check_connection()
+            print(f"  🔗 API: {'连接正常' if api_status else '连接异常'}")
+        except Exception:
+            print(f"  🔗 API: 连接异常")
+    
+    def _print_logs(self, logs: Dict[str, Any]):
+        """打印日志"""
+        if not logs.get('logs'):
+            print("📋 暂无日志")
+            return
+        
+        lines = [f"📋 日志 (共 {len(logs['logs'])} 条):"]
+        
+        verbose = self.verbose
+        for log in logs['logs']:
+            level_icon = _LEVEL_ICONS.get(log.get('level', 'info'), 'ℹ️')
+            
+            lines.append(f"  {level_icon} {log.get('timestamp')} - {log.get('message')}")
+            if verbose and log.get('context'):
+                lines.append(f"    上下文: {log['context']}")
+        
+        _write_lines(lines)
+    
+    def _print_config_info(self, config_info: Dict[str, Any]):
+        """打印配置信息"""
+        print("⚙️ 配置信息:")
+        print(f"  配置文件: {config_info.get('file_path')}")
+        print(f"  修改时间: {config_info.get('last_modified')}")
+        print(f"  文件大小: {config_info.get('file_size', 0)} bytes")
+        print(f"  备份数量: {config_info.get('backup_count', 0)}")
+    
+    def _print_report(self, report: Dict[str, Any]):
+        """打印报告"""
+        lines = [
+            "📊 报告:",
+            f"  生成时间: {report.get('generated_at')}",
+            f"  报告类型: {report.get('type')}",
+            f"  时间范围: {report.get('period')}",
+        ]
+        
+        if report.get('summary'):
+            lines.append("  摘要:")
+            for key, value in report['summary'].items():
+                lines.append(f"    {key}: {value}")
+        
+        _write_lines(lines)
+    
+    def _print_database_info(self, info: Dict[str, Any]):
+        """打印数据库信息"""
+        print("📊 数据库信息:")
+        print(f"  文件路径: {info.get('file_path')}")
+        print(f"  文件大小: {info.get('file_size_mb', 0):.2f} MB")
+        print(f"  表数量: {info.get('table_count', 0)}")
+        print(f"  连接数: {info.get('connection_count', 0)}")
+        print(f"  WAL模式: {'是' if info.get('wal_mode') else '否'}")
+    
+    def _print_database_stats(self, stats: Dict[str, Any]):
+        """打印数据库统计"""
+        lines = ["📊 数据库统计:"]
+        for table, table_stats in stats.items():
+            lines.append(f"  {table}:")
+            lines.append(f"    记录数: {table_stats.get('count', 0)}")
+            lines.append(f"    大小: {table_stats.get('size_mb', 0):.2f} MB")
+        
+        _write_lines(lines)
+    
+    def _print_query_results(self, results: List[Any]):
+        """打印查询结果"""
+        if not results:
+            print("📋 查询结果为空")
+            return
+        
+        lines = [f"📋 查询结果 (共 {len(results)} 条):"]
+        lines.extend(f"  {i}. {row}" for i, row in enumerate(results, 1))
+        
+        _write_lines(lines)
+    
+    def _generate_report(self, report_type: str, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+        """生成报告"""
+        from datetime import datetime, timedelta
+        
+        # 整个报告使用同一个时间点
+        now = datetime.now()
+        
+        if not end_date:
+            end_date = now.strftime('%Y-%m-%d')
+        
+        if not start_date:
+            if report_type == 'daily':
+                start_date = end_date
+            else:
+                days = _REPORT_LOOKBACK_DAYS.get(report_type, 1)
+                start_date = (now - timedelta(days=days)).strftime('%Y-%m-%d')
+        
+        # 生成报告内容
+        report = {
+            'type': report_type,
+            'period': f"{start_date} to {end_date}",
+            'generated_at': now.isoformat(),
+            'summary': {
+                'total_stocks': 0,
+                'total_records': 0,
+                'download_success': 0,
+                'download_failed': 0
+            }
+        }
+        
+        # 添加具体统计
+        try:
+            # 下载统计
+            download_stats = self.status_manager.get_download_statistics()
+            report['download_stats'] = download_stats
+            
+            # 任务统计
+            task_history = self.schedule_manager.get_task_history(100)
+            report['task_stats'] = {
+                'total_tasks': len(task_history),
+                'completed_tasks': len([t for t in task_history if t['status'] == 'completed']),
+                'failed_tasks': len([t for t in task_history if t['status'] == 'failed'])
+            }
+            
+            # 数据库统计
+            db_stats = self._get_database_stats()
+            report['database_stats'] = db_stats
+            
+        except Exception as e:
+            report['error'] = str(e)
+        
+        return report
+    
+    def _get_database_stats(self) -> Dict[str, Any]:
+        """获取数据库统计"""
+        tables = ['stocks', 'daily_data', 'download_status', 'api_call_log']
+        
+        try:
+            return self.db_manager.get_table_statistics_batch(tables)
+        except Exception:
+            return {table: {'count': 0, 'size_mb': 0} for table in tables}
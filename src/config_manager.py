@@ -5,15 +5,45 @@
 提供配置文件的读取、写入、验证和管理功能
 """
 
-import json
+import copy
 import os
 import shutil
 import logging
+import operator
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional, Union
+from functools import lru_cache, reduce
+from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
 import argparse
 
+try:
+    from .json_utils import dumps, loads
+except ImportError:  # 作为脚本直接运行时（python src/config_manager.py）没有包上下文
+    from json_utils import dumps, loads
+
+# get() 缓存中表示"配置键不存在"的标记，与值为 None 的配置项区分
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> tuple:
+    """拆分点号分隔的配置键（结果缓存，重复键不再重复 split）"""
+    return tuple(key.split('.'))
+
+
+def _to_bool(value: str) -> bool:
+    """将环境变量字符串转换为布尔值"""
+    return value.lower() in ('true', '1', 'yes')
+
+
+# 环境变量覆盖表：(环境变量名, 配置键, 类型转换函数)
+_ENV_OVERRIDES = (
+    ('TUSHARE_TOKEN', 'tushare.token', str),
+    ('DB_PATH', 'database.path', str),
+    ('DEBUG_MODE', 'system.debug_mode', _to_bool),
+)
+
 
 class ConfigManager:
     """配置管理器类
@@ -36,6 +66,14 @@ class ConfigManager:
         self.backup_dir = self.config_dir / "backups"
         self._config = {}
         self._default_config = {}
+        # 点号键 -> 解析结果的缓存，任何修改 _config 的操作都要调用 _invalidate_cache()
+        self._get_cache: Dict[str, Any] = {}
+        # 配置版本号，每次 _invalidate_cache() 递增，用于判断派生结果是否过期
+        self._version = 0
+        # get_config_info() 的结果缓存：((配置文件mtime, 备份目录mtime, 版本号), 信息字典)
+        self._info_cache: Optional[tuple] = None
+        # 最近一次写入的 (内容哈希, 写入后的文件mtime)，内容与文件都未变时 save() 直接跳过
+        self._last_saved: Optional[tuple] = None
         self.logger = logging.getLogger(__name__)
         
         # 确保配置目录存在
@@ -63,7 +101,10 @@ class ConfigManager:
                 "backup_path": "data/backups/",
                 "connection_timeout": 30,
                 "enable_foreign_keys": True,
-                "enable_wal_mode": True
+                "enable_wal_mode": True,
+                "synchronous": "NORMAL",
+                "parquet_cache_path": None,
+                "parquet_cache_max_files": 250
             },
             "api_limits": {
                 "free_account": {
@@ -119,10 +160,16 @@ class ConfigManager:
         if not self.config_file.exists():
             self.logger.info(f"配置文件不存在，创建默认配置文件: {self.config_file}")
             self._create_default_config()
+            
+            # 刚写入的就是默认配置，无需再读回解析
+            self._config = copy.deepcopy(self._default_config)
+            self._apply_env_overrides()
+            self._invalidate_cache()
+            return
         
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                self._config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                self._config = loads(f.read())
             
             # 合并默认配置，确保所有必要的配置项都存在
             self._merge_default_config()
@@ -130,56 +177,67 @@ class ConfigManager:
             # 应用环境变量覆盖
             self._apply_env_overrides()
             
-            self.logger.info(f"配置文件加载成功: {self.config_file}")
+            self.logger.debug("配置文件加载成功: %s", self.config_file)
             
         except Exception as e:
             self.logger.error(f"加载配置文件失败: {e}")
             self.logger.info("使用默认配置")
             self._config = self._default_config.copy()
+        
+        self._invalidate_cache()
+    
+    def _invalidate_cache(self):
+        """清空 get() 的查找缓存并使派生结果失效"""
+        self._get_cache.clear()
+        self._version += 1
     
     def _create_default_config(self):
         """创建默认配置文件"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._default_config, f, indent=4, ensure_ascii=False)
+            payload = dumps(self._default_config).encode('utf-8')
+            self._write_config_file(payload)
+            self._last_saved = (hash(payload), self.config_file.stat().st_mtime_ns)
             self.logger.info(f"默认配置文件创建成功: {self.config_file}")
         except Exception as e:
             self.logger.error(f"创建默认配置文件失败: {e}")
             raise
     
+    def _write_config_file(self, payload: bytes):
+        """写入配置文件
+        
+        先写临时文件再原子替换：配置文件每次都是新的 inode，
+        save() 中刚与之硬链接的备份文件不会被改写。
+        """
+        tmp_file = self.config_file.with_suffix(self.config_file.suffix + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, self.config_file)
+    
     def _merge_default_config(self):
         """合并默认配置，确保所有必要的配置项都存在"""
-        def merge_dict(default: dict, user: dict) -> dict:
-            """递归合并字典"""
-            result = default.copy()
+        # 在默认配置的深拷贝上原地合并用户配置，用显式栈代替递归
+        result = copy.deepcopy(self._default_config)
+        stack = [(result, self._config)]
+        while stack:
+            target, user = stack.pop()
             for key, value in user.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = merge_dict(result[key], value)
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
                 else:
-                    result[key] = value
-            return result
+                    target[key] = value
         
-        self._config = merge_dict(self._default_config, self._config)
+        self._config = result
     
     def _apply_env_overrides(self):
         """应用环境变量覆盖"""
-        # Tushare Token
-        tushare_token = os.getenv('TUSHARE_TOKEN')
-        if tushare_token:
-            self._config['tushare']['token'] = tushare_token
-            self.logger.info("使用环境变量 TUSHARE_TOKEN 覆盖配置")
-        
-        # 数据库路径
-        db_path = os.getenv('DB_PATH')
-        if db_path:
-            self._config['database']['path'] = db_path
-            self.logger.info("使用环境变量 DB_PATH 覆盖配置")
-        
-        # 调试模式
-        debug_mode = os.getenv('DEBUG_MODE')
-        if debug_mode:
-            self._config['system']['debug_mode'] = debug_mode.lower() in ('true', '1', 'yes')
-            self.logger.info("使用环境变量 DEBUG_MODE 覆盖配置")
+        log_overrides = self.logger.isEnabledFor(logging.INFO)
+        
+        for env_name, key, cast in _ENV_OVERRIDES:
+            value = os.environ.get(env_name)
+            if value:
+                self.set(key, cast(value), save=False)
+                if log_overrides:
+                    self.logger.info(f"使用环境变量 {env_name} 覆盖配置")
     
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值
@@ -191,15 +249,29 @@ class ConfigManager:
         Returns:
             配置值
         """
-        keys = key.split('.')
-        value = self._config
-        
         try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+            value = self._get_cache[key]
+        except KeyError:
+            try:
+                value = reduce(operator.getitem, _split_key(key), self._config)
+            except (KeyError, TypeError):
+                value = _MISSING
+            self._get_cache[key] = value
+        
+        return default if value is _MISSING else value
+    
+    def get_many(self, keys: Union[List[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """批量获取配置值
+        
+        Args:
+            keys: 配置键列表，或 {配置键: 默认值} 字典（列表形式的默认值为 None）
+            
+        Returns:
+            {配置键: 配置值} 字典
+        """
+        if isinstance(keys, dict):
+            return {key: self.get(key, default) for key, default in keys.items()}
+        return {key: self.get(key) for key in keys}
     
     def set(self, key: str, value: Any, save: bool = True):
         """设置配置值
@@ -209,7 +281,7 @@ class ConfigManager:
             value: 配置值
             save: 是否立即保存到文件
         """
-        keys = key.split('.')
+        keys = _split_key(key)
         config = self._config
         
         # 导航到父级字典
@@ -220,6 +292,7 @@ class ConfigManager:
         
         # 设置值
         config[keys[-1]] = value
+        self._invalidate_cache()
         
         if save:
             self.save()
@@ -227,15 +300,28 @@ class ConfigManager:
     def save(self):
         """保存配置到文件"""
         try:
-            # 创建备份
-            if self.config_file.exists():
-                self.backup()
+            payload = dumps(self._config).encode('utf-8')
+            digest = hash(payload)
+            
+            try:
+                mtime = self.config_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            
+            # 内容与上次写入相同且文件未被外部修改，无需备份和重写
+            if self._last_saved == (digest, mtime):
+                self.logger.debug("配置未变化，跳过保存: %s", self.config_file)
+                return
+            
+            # 创建备份：紧接着的原子替换会断开硬链接，链接即可作为备份
+            if mtime is not None:
+                self._backup(link=True)
             
             # 保存配置
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=4, ensure_ascii=False)
+            self._write_config_file(payload)
+            self._last_saved = (digest, self.config_file.stat().st_mtime_ns)
             
-            self.logger.info(f"配置文件保存成功: {self.config_file}")
+            self.logger.debug("配置文件保存成功: %s", self.config_file)
             
         except Exception as e:
             self.logger.error(f"保存配置文件失败: {e}")
@@ -244,6 +330,18 @@ class ConfigManager:
     def backup(self) -> str:
         """备份配置文件
         
+        Returns:
+            备份文件路径
+        """
+        return self._backup(link=False)
+    
+    def _backup(self, link: bool) -> str:
+        """备份配置文件
+        
+        Args:
+            link: 以硬链接代替复制。只能在随后立即原子替换配置文件时使用（见 save()），
+                否则用户原地编辑配置文件时，同一 inode 的备份会随之改变
+        
         Returns:
             备份文件路径
         """
@@ -254,7 +352,17 @@ class ConfigManager:
         backup_file = self.backup_dir / f"config_backup_{timestamp}.json"
         
         try:
-            shutil.copy2(self.config_file, backup_file)
+            if link:
+                # 跨文件系统或不支持硬链接时回退到复制
+                try:
+                    # 同一秒内重复备份时覆盖旧备份，与复制时的行为一致
+                    if backup_file.exists():
+                        backup_file.unlink()
+                    os.link(self.config_file, backup_file)
+                except OSError:
+                    shutil.copy2(self.config_file, backup_file)
+            else:
+                shutil.copy2(self.config_file, backup_file)
             self.logger.info(f"配置文件备份成功: {backup_file}")
             return str(backup_file)
         except Exception as e:
@@ -272,7 +380,10 @@ class ConfigManager:
             raise FileNotFoundError(f"备份文件不存在: {backup_file}")
         
         try:
-            shutil.copy2(backup_path, self.config_file)
+            # 经临时文件原子替换，中断时不会留下写了一半的配置文件
+            tmp_file = self.config_file.with_suffix(self.config_file.suffix + '.tmp')
+            shutil.copy2(backup_path, tmp_file)
+            os.replace(tmp_file, self.config_file)
             self.reload()
             self.logger.info(f"配置文件恢复成功: {backup_file}")
         except Exception as e:
@@ -287,34 +398,40 @@ class ConfigManager:
         """
         errors = []
         
+        # 各配置段只取一次
+        config = self._config
+        tushare = config.get('tushare') or {}
+        database = config.get('database') or {}
+        logging_config = config.get('logging') or {}
+        api_limits = (config.get('api_limits') or {}).get('free_account')
+        
         # 验证 Tushare Token
-        if not self.get('tushare.token'):
+        if not tushare.get('token'):
             errors.append("Tushare Token 未配置")
         
         # 验证数据库路径
-        db_path = self.get('database.path')
+        db_path = database.get('path')
         if not db_path:
             errors.append("数据库路径未配置")
         else:
             db_dir = Path(db_path).parent
-            if not db_dir.exists():
+            if not db_dir.is_dir():
                 try:
                     db_dir.mkdir(parents=True, exist_ok=True)
                 except Exception as e:
                     errors.append(f"无法创建数据库目录: {e}")
         
         # 验证日志路径
-        log_path = self.get('logging.file_path')
+        log_path = logging_config.get('file_path')
         if log_path:
             log_dir = Path(log_path).parent
-            if not log_dir.exists():
+            if not log_dir.is_dir():
                 try:
                     log_dir.mkdir(parents=True, exist_ok=True)
                 except Exception as e:
                     errors.append(f"无法创建日志目录: {e}")
         
         # 验证API限制配置
-        api_limits = self.get('api_limits.free_account')
         if api_limits:
             required_fields = ['total_points', 'calls_per_minute', 'calls_per_hour', 'calls_per_day']
             for field in required_fields:
@@ -323,22 +440,55 @@ class ConfigManager:
         
         return len(errors) == 0, errors
     
+    def _scan_backups(self) -> list:
+        """扫描备份目录，返回按文件名（即时间戳）升序排列的备份文件条目
+        
+        使用 os.scandir，一次读取目录即可拿到文件名，DirEntry 还会缓存 stat 结果。
+        """
+        try:
+            with os.scandir(self.backup_dir) as it:
+                entries = [
+                    entry for entry in it
+                    if entry.name.startswith('config_backup_') and entry.name.endswith('.json')
+                ]
+        except FileNotFoundError:
+            return []
+        
+        entries.sort(key=lambda entry: entry.name)
+        return entries
+    
     def get_config_info(self) -> dict:
         """获取配置信息
         
         Returns:
             配置信息字典
         """
-        return {
+        try:
+            config_stat = self.config_file.stat()
+        except FileNotFoundError:
+            config_stat = None
+        try:
+            backup_mtime = self.backup_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            backup_mtime = 0
+        
+        # 配置文件、备份目录和内存配置都未变化时直接返回上次的结果
+        cache_key = (config_stat.st_mtime_ns if config_stat else 0, backup_mtime, self._version)
+        if self._info_cache is not None and self._info_cache[0] == cache_key:
+            return self._info_cache[1]
+        
+        info = {
             "config_file": str(self.config_file),
-            "config_exists": self.config_file.exists(),
-            "config_size": self.config_file.stat().st_size if self.config_file.exists() else 0,
-            "backup_count": len(list(self.backup_dir.glob("config_backup_*.json"))),
+            "config_exists": config_stat is not None,
+            "config_size": config_stat.st_size if config_stat else 0,
+            "backup_count": len(self._scan_backups()),
             "tushare_token_configured": bool(self.get('tushare.token')),
             "database_path": self.get('database.path'),
             "logging_level": self.get('logging.level'),
             "scheduler_enabled": self.get('scheduler.enabled')
         }
+        self._info_cache = (cache_key, info)
+        return info
     
     def list_backups(self) -> list[dict]:
         """列出所有备份文件
@@ -347,13 +497,13 @@ class ConfigManager:
             备份文件信息列表
         """
         backups = []
-        for backup_file in sorted(self.backup_dir.glob("config_backup_*.json"), reverse=True):
-            stat = backup_file.stat()
+        for entry in reversed(self._scan_backups()):
+            stat = entry.stat()
             backups.append({
-                "file": str(backup_file),
-                "name": backup_file.name,
+                "file": entry.path,
+                "name": entry.name,
                 "size": stat.st_size,
-                "created": datetime.fromtimestamp(stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
+                "created": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat.st_ctime))
             })
         return backups
     
@@ -363,14 +513,14 @@ class ConfigManager:
         Args:
             keep_count: 保留的备份数量
         """
-        backups = sorted(self.backup_dir.glob("config_backup_*.json"))
-        if len(backups) > keep_count:
-            for backup_file in backups[:-keep_count]:
-                try:
-                    backup_file.unlink()
-                    self.logger.info(f"删除旧备份文件: {backup_file}")
-                except Exception as e:
-                    self.logger.error(f"删除备份文件失败: {e}")
+        backups = self._scan_backups()
+        # 文件名中的时间戳按字典序即时间顺序，最旧的在前
+        for entry in backups[:max(len(backups) - keep_count, 0)]:
+            try:
+                os.unlink(entry.path)
+                self.logger.info(f"删除旧备份文件: {entry.path}")
+            except OSError as e:
+                self.logger.error(f"删除备份文件失败: {e}")
     
     def export_config(self, export_file: str, include_sensitive: bool = False):
         """导出配置到文件
@@ -389,8 +539,8 @@ class ConfigManager:
                 config_to_export['notifications']['email']['password'] = "***"
         
         try:
-            with open(export_file, 'w', encoding='utf-8') as f:
-                json.dump(config_to_export, f, indent=4, ensure_ascii=False)
+            with open(export_file, 'wb') as f:
+                f.write(dumps(config_to_export).encode('utf-8'))
             self.logger.info(f"配置导出成功: {export_file}")
         except Exception as e:
             self.logger.error(f"导出配置失败: {e}")
@@ -407,8 +557,8 @@ class ConfigManager:
             raise FileNotFoundError(f"导入文件不存在: {import_file}")
         
         try:
-            with open(import_path, 'r', encoding='utf-8') as f:
-                imported_config = json.load(f)
+            with open(import_path, 'rb') as f:
+                imported_config = loads(f.read())
             
             # 备份当前配置
             self.backup()
@@ -416,6 +566,7 @@ class ConfigManager:
             # 合并配置
             self._config = imported_config
             self._merge_default_config()
+            self._invalidate_cache()
             
             # 保存配置
             self.save()
@@ -435,8 +586,13 @@ class ConfigManager:
         self.set(key, value)
     
     def __contains__(self, key: str) -> bool:
-        """支持 in 操作符"""
-        return self.get(key) is not None
+        """支持 in 操作符（值为 None 的配置项也视为存在）"""
+        value = self._config
+        for k in _split_key(key):
+            if not isinstance(value, dict) or k not in value:
+                return False
+            value = value[k]
+        return True
 
 
 def main():
@@ -12,17 +12,140 @@
 
 import os
 import sys
+import logging
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
-import time
 import sqlite3
 
 from .database_manager import DatabaseManager
 from .optimized_tushare_api_manager import OptimizedTushareAPIManager
 from .stock_basic_manager import StockBasicManager
 
+try:
+    from tqdm import tqdm
+except ImportError:  # 未安装 tqdm 时不显示进度条，逐日进度写入日志
+    tqdm = None
+
+# 只检查 pyarrow 是否可用，不在导入本模块时加载
+_PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+def _compact_strings(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    安装了 pyarrow 时，将字符串列转换为 Arrow 存储的 string 类型（比逐个Python对象更省内存）
+    
+    只转换 object 列，数值列保持 NumPy 类型；本地数据、Parquet快照和API下载的数据
+    都经此处理，同一方法返回的列类型不随缓存状态变化。
+    """
+    if not _PYARROW_AVAILABLE:
+        return data
+    columns = data.select_dtypes(include='object').columns
+    if len(columns) == 0:
+        return data
+    return data.astype(dict.fromkeys(columns, 'string[pyarrow]'))
+
+
+# daily_data 表的写入列，顺序与插入语句的占位符一致
+_DAILY_DATA_COLUMNS = [
+    'ts_code', 'trade_date', 'open', 'high', 'low', 'close', 'pre_close',
+    'change', 'pct_chg', 'vol', 'amount'
+]
+
+# 数值列（表中均为REAL），写入前统一按float64处理
+_NUMERIC_COLUMNS = _DAILY_DATA_COLUMNS[2:]
+
+_INSERT_DAILY_DATA_SQL = f"""
+INSERT OR REPLACE INTO daily_data 
+({', '.join(_DAILY_DATA_COLUMNS)})
+VALUES """
+
+# 单行占位符，多行插入时重复拼接
+_DAILY_DATA_ROW_PLACEHOLDER = f"({', '.join('?' * len(_DAILY_DATA_COLUMNS))})"
+
+# 每条多行INSERT包含的行数，保证绑定参数总数不超过SQLite默认上限999
+_ROWS_PER_INSERT = 999 // len(_DAILY_DATA_COLUMNS)
+
+
+# 统计计数项，顺序即结果摘要中的顺序
+_STAT_COUNTERS = (
+    'total_dates_processed', 'total_records_downloaded', 'successful_dates',
+    'failed_dates', 'skipped_dates', 'api_calls_made', 'cache_hits'
+)
+
+# 初始统计信息，每次批量下载开始时以此重置
+_EMPTY_STATS = dict.fromkeys(_STAT_COUNTERS, 0)
+_EMPTY_STATS.update(start_time=None, end_time=None)
+
+
+def _to_db_date(trade_date: str) -> str:
+    """将 YYYYMMDD 格式的日期转换为库中存储的 YYYY-MM-DD 格式"""
+    return f"{trade_date[:4]}-{trade_date[4:6]}-{trade_date[6:8]}"
+
+
+@lru_cache(maxsize=None)
+def _build_insert_sql(row_count: int) -> str:
+    """构造插入指定行数的多行INSERT语句（同一行数复用同一字符串）"""
+    return _INSERT_DAILY_DATA_SQL + ', '.join([_DAILY_DATA_ROW_PLACEHOLDER] * row_count)
+
+
+# 满行数的语句最常用，预先构造
+_FULL_INSERT_SQL = _build_insert_sql(_ROWS_PER_INSERT)
+
+# 按日期查询的语句保持为固定文本，sqlite3 连接的语句缓存按文本命中，
+# 复用同一连接时无需重复解析
+_HAS_DATE_SQL = "SELECT 1 FROM daily_data WHERE trade_date = ? LIMIT 1"
+
+_LOAD_DATE_SQL = "SELECT * FROM daily_data WHERE trade_date = ? ORDER BY ts_code"
+
+# 按日期的数据版本：daily_data 的每次写入都由触发器递增所涉日期的版本号，
+# 不论写入方是本模块、DataStorageManager 的 ON CONFLICT DO UPDATE 还是修复与去重。
+# Parquet快照以版本号命名，当日数据改动后旧快照不会再被命中
+_DATE_VERSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS daily_data_version (
+    trade_date TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+_BUMP_DATE_VERSION_SQL = """
+INSERT INTO daily_data_version (trade_date, version) VALUES ({row}.trade_date, 1)
+ON CONFLICT (trade_date) DO UPDATE SET version = version + 1;
+"""
+
+# (触发器名, 触发时机, 取日期的行)；REPLACE 删除旧行时不触发删除触发器，
+# 但同一日期的插入触发器会递增版本
+_DATE_VERSION_TRIGGERS = (
+    ('daily_data_version_insert', 'AFTER INSERT ON daily_data', 'NEW'),
+    ('daily_data_version_update', 'AFTER UPDATE ON daily_data', 'OLD'),
+    ('daily_data_version_move',
+     'AFTER UPDATE OF trade_date ON daily_data FOR EACH ROW WHEN NEW.trade_date IS NOT OLD.trade_date',
+     'NEW'),
+    ('daily_data_version_delete', 'AFTER DELETE ON daily_data', 'OLD'),
+)
+
+_DATE_VERSION_SQL = "SELECT version FROM daily_data_version WHERE trade_date = ?"
+
+# 版本表及其触发器是否存在（缓存关闭时据此决定是否需要删除）
+_HAS_DATE_VERSIONS_SQL = (
+    "SELECT 1 FROM sqlite_master WHERE name IN ('daily_data_version', "
+    + ', '.join(f"'{name}'" for name, _, _ in _DATE_VERSION_TRIGGERS)
+    + ") LIMIT 1"
+)
+
+
+def _echo(message: str):
+    """输出面向用户的逐日结果；批量下载显示进度条时经 tqdm.write 输出，不打断进度条"""
+    if tqdm is not None:
+        tqdm.write(message)
+    else:
+        print(message)
+
 
 class DailyDataManager:
     """日线数据获取管理器"""
@@ -35,67 +158,180 @@ class DailyDataManager:
             config_manager: 配置管理器实例
         """
         self.config = config_manager
+        self.logger = logging.getLogger(__name__)
         db_path = config_manager.get('database_path', 'data/stock_data.db')
-        self.db_manager = DatabaseManager(db_path)
+        self.db_manager = DatabaseManager(
+            db_path, config_manager.get('database.synchronous', 'NORMAL')
+        )
         self.api_manager = OptimizedTushareAPIManager(config_manager)
         self.stock_manager = StockBasicManager(config_manager)
         
+        # 按日期的Parquet快照缓存目录，需要 pyarrow，未配置时不启用
+        parquet_cache_path = config_manager.get('database.parquet_cache_path')
+        self.parquet_cache_dir = (
+            Path(parquet_cache_path) if parquet_cache_path and _PYARROW_AVAILABLE else None
+        )
+        # 最多保留的快照文件数，超出时删除最久未使用的
+        self.parquet_cache_max_files = config_manager.get('database.parquet_cache_max_files', 250)
+        
+        # 长连接：首次查询时打开，之后所有查询复用，close() 时关闭
+        self._conn: Optional[sqlite3.Connection] = None
+        
         # 初始化统计信息
-        self.stats = {
-            'total_dates_processed': 0,
-            'total_records_downloaded': 0,
-            'successful_dates': 0,
-            'failed_dates': 0,
-            'skipped_dates': 0,
-            'api_calls_made': 0,
-            'cache_hits': 0,
-            'start_time': None,
-            'end_time': None
-        }
-    
-    def get_daily_data_by_date(self, trade_date: str, force_update: bool = False) -> pd.DataFrame:
+        self.stats = dict(_EMPTY_STATS)
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取复用的数据库连接"""
+        if self._conn is None:
+            self._conn = self.db_manager.connect()
+            self._ensure_indexes(self._conn)
+            if self.parquet_cache_dir is not None:
+                self._ensure_date_versions(self._conn)
+            else:
+                self._drop_date_versions(self._conn)
+        return self._conn
+    
+    def _ensure_indexes(self, conn: sqlite3.Connection):
+        """
+        确保按日期查询所用的索引存在
+        
+        未经 database_init.sql 初始化的数据库可能缺少该索引；
+        (ts_code, trade_date) 已由表的唯一约束索引覆盖，无需另建。
+        """
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_daily_data_trade_date ON daily_data(trade_date)"
+                )
+        except sqlite3.Error as e:
+            self.logger.warning("创建日线数据索引失败: %s", e)
+    
+    def _ensure_date_versions(self, conn: sqlite3.Connection):
+        """
+        确保按日期的数据版本表及维护它的触发器存在
+        
+        版本表是新建的（如数据库被重建）时，已有快照无法与数据对应，全部清除。
+        创建失败时关闭Parquet快照缓存。
+        """
+        try:
+            is_new = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_data_version'"
+            ).fetchone() is None
+            
+            with conn:
+                conn.execute(_DATE_VERSION_TABLE_SQL)
+                for name, timing, row in _DATE_VERSION_TRIGGERS:
+                    conn.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {name} {timing} "
+                        f"BEGIN {_BUMP_DATE_VERSION_SQL.format(row=row)} END"
+                    )
+            
+            if is_new:
+                self.clear_parquet_cache()
+                
+        except sqlite3.Error as e:
+            self.logger.warning("创建日线数据版本触发器失败，不使用Parquet快照: %s", e)
+            self.parquet_cache_dir = None
+    
+    def _drop_date_versions(self, conn: sqlite3.Connection):
+        """
+        Parquet快照缓存关闭时删除数据版本表及其触发器
+        
+        触发器让 daily_data 的每行写入多一次版本表更新，不再读取快照时不应继续承担。
+        之后重新启用缓存时版本表是新建的，遗留的快照会被全部清除。
+        """
+        try:
+            if conn.execute(_HAS_DATE_VERSIONS_SQL).fetchone() is None:
+                return
+            
+            with conn:
+                for name, _, _ in _DATE_VERSION_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute("DROP TABLE IF EXISTS daily_data_version")
+            self.logger.info("Parquet快照缓存已关闭，删除日线数据版本表及触发器")
+                
+        except sqlite3.Error as e:
+            self.logger.warning("删除日线数据版本触发器失败: %s", e)
+    
+    def clear_parquet_cache(self):
+        """删除全部Parquet快照文件"""
+        if self.parquet_cache_dir is None or not self.parquet_cache_dir.exists():
+            return
+        for cache_file in self.parquet_cache_dir.glob("daily_*.parquet"):
+            cache_file.unlink(missing_ok=True)
+    
+    def close(self):
+        """关闭数据库连接"""
+        if self._conn is not None:
+            if self.db_manager.connection is self._conn:
+                self.db_manager.connection = None
+            self._conn.close()
+            self._conn = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def get_daily_data_by_date(self, trade_date: str, force_update: bool = False,
+                               check_trade_date: bool = True) -> pd.DataFrame:
         """
         按交易日期获取所有股票的日线数据
         
         Args:
             trade_date: 交易日期 (YYYYMMDD格式)
             force_update: 是否强制更新，忽略本地数据
+            check_trade_date: 是否检查交易日，调用方已按交易日历筛选过时可传False
         
         Returns:
             pd.DataFrame: 指定日期的所有股票日线数据
         """
-        print(f"🔍 获取 {trade_date} 的日线数据...")
+        self.logger.debug("获取 %s 的日线数据", trade_date)
         
         # 转换日期格式以供is_trade_date使用
-        formatted_date = f"{trade_date[:4]}-{trade_date[4:6]}-{trade_date[6:8]}"
+        formatted_date = _to_db_date(trade_date)
         
         # 检查是否为交易日
-        if not self.api_manager.is_trade_date(formatted_date):
-            print(f"⚠️  {trade_date} 不是交易日，跳过")
+        if check_trade_date and not self.api_manager.is_trade_date(formatted_date):
+            _echo(f"⚠️  {trade_date} 不是交易日，跳过")
             self.stats['skipped_dates'] += 1
             return pd.DataFrame()
         
         # 如果不强制更新，检查本地是否已有数据
         if not force_update and self._has_local_data(trade_date):
-            print(f"📋 本地已存在 {trade_date} 的数据，使用本地数据")
+            _echo(f"📋 本地已存在 {trade_date} 的数据，使用本地数据")
             return self._load_local_data(trade_date)
         
-        # 从API获取数据
-        daily_data = self.api_manager.get_daily_data(trade_date=trade_date)
+        # 从API获取数据（api_manager 需要 YYYY-MM-DD 格式）
+        daily_data = self.api_manager.get_daily_data(trade_date=formatted_date)
+        return self._handle_downloaded_data(trade_date, daily_data)
+    
+    def _handle_downloaded_data(self, trade_date: str, daily_data: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """
+        保存API返回的数据并更新统计信息
         
+        Args:
+            trade_date: 交易日期 (YYYYMMDD格式)
+            daily_data: API返回的数据，失败时为None
+        
+        Returns:
+            pd.DataFrame: 获取到的数据，失败时为空DataFrame
+        """
         if daily_data is not None and not daily_data.empty:
             # 保存到数据库
             self._save_to_database(daily_data)
             
             # 更新统计信息
-            self.stats['total_records_downloaded'] += len(daily_data)
-            self.stats['successful_dates'] += 1
-            self.stats['api_calls_made'] += 1
+            stats = self.stats
+            stats['total_records_downloaded'] += len(daily_data)
+            stats['successful_dates'] += 1
+            stats['api_calls_made'] += 1
             
-            print(f"✅ 成功获取 {trade_date} 的 {len(daily_data)} 条数据")
-            return daily_data
+            _echo(f"✅ 成功获取 {trade_date} 的 {len(daily_data)} 条数据")
+            return _compact_strings(daily_data)
         else:
-            print(f"❌ 获取 {trade_date} 的数据失败")
+            _echo(f"❌ 获取 {trade_date} 的数据失败")
             self.stats['failed_dates'] += 1
             return pd.DataFrame()
     
@@ -118,14 +354,7 @@ class DailyDataManager:
         print("=" * 60)
         
         # 重置统计信息
-        self.stats['start_time'] = datetime.now()
-        self.stats['total_dates_processed'] = 0
-        self.stats['total_records_downloaded'] = 0
-        self.stats['successful_dates'] = 0
-        self.stats['failed_dates'] = 0
-        self.stats['skipped_dates'] = 0
-        self.stats['api_calls_made'] = 0
-        self.stats['cache_hits'] = 0
+        self.stats = dict(_EMPTY_STATS, start_time=datetime.now())
         
         # 设置结束日期
         if end_date is None:
@@ -155,22 +384,23 @@ class DailyDataManager:
         
         print(f"🔄 需要下载 {len(remaining_dates)} 个交易日的数据")
         
-        # 逐个下载数据
-        for i, trade_date in enumerate(remaining_dates, 1):
-            print(f"\n进度 [{i}/{len(remaining_dates)}] 正在处理 {trade_date}")
-            
-            try:
-                daily_data = self.get_daily_data_by_date(trade_date, force_update=True)
-                self.stats['total_dates_processed'] += 1
-                
-                # 添加延迟，避免API频率限制
-                if i < len(remaining_dates):
-                    print("⏱️  等待API频率限制...")
-                    time.sleep(2)  # 2秒延迟
+        max_workers = max(1, int(self.config.get('download.max_workers', 1)))
+        if max_workers > 1 and len(remaining_dates) > 1:
+            self._download_dates_concurrently(remaining_dates, max_workers)
+        else:
+            # 逐个下载数据
+            for i, trade_date in enumerate(self._progress(remaining_dates), 1):
+                self.logger.debug("进度 [%d/%d] 正在处理 %s", i, len(remaining_dates), trade_date)
                 
-            except Exception as e:
-                print(f"❌ 处理 {trade_date} 时发生错误: {e}")
-                self.stats['failed_dates'] += 1
+                try:
+                    # remaining_dates 已按交易日历和本地数据筛选过，跳过逐日的交易日与本地数据检查；
+                    # API频率限制由 api_manager 在真正发起请求前控制（命中缓存时无需等待）
+                    self.get_daily_data_by_date(trade_date, force_update=True, check_trade_date=False)
+                    self.stats['total_dates_processed'] += 1
+                    
+                except Exception as e:
+                    _echo(f"❌ 处理 {trade_date} 时发生错误: {e}")
+                    self.stats['failed_dates'] += 1
         
         # 完成统计
         self.stats['end_time'] = datetime.now()
@@ -181,98 +411,173 @@ class DailyDataManager:
         
         return self._get_result_summary()
     
+    def _download_dates_concurrently(self, trade_dates: List[str], max_workers: int):
+        """
+        使用有界线程池并发下载多个交易日的数据
+        
+        工作线程只负责调用API，入库与统计在主线程按完成顺序进行，
+        保证SQLite连接和统计信息只被单个线程访问。
+        API频率限制仍由 api_manager 统一控制。
+        
+        Args:
+            trade_dates: 待下载的交易日期列表 (YYYYMMDD格式)
+            max_workers: 最大并发线程数
+        """
+        print(f"🧵 使用 {max_workers} 个线程并发下载")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.api_manager.get_daily_data,
+                    trade_date=_to_db_date(d)
+                ): d
+                for d in trade_dates
+            }
+            
+            completed = self._progress(as_completed(futures), total=len(trade_dates))
+            for i, future in enumerate(completed, 1):
+                trade_date = futures[future]
+                self.logger.debug("进度 [%d/%d] 正在处理 %s", i, len(trade_dates), trade_date)
+                
+                try:
+                    self._handle_downloaded_data(trade_date, future.result())
+                    self.stats['total_dates_processed'] += 1
+                    
+                except Exception as e:
+                    _echo(f"❌ 处理 {trade_date} 时发生错误: {e}")
+                    self.stats['failed_dates'] += 1
+    
+    @staticmethod
+    def _progress(iterable, total: int = None):
+        """
+        为批量下载循环包装进度条，每批只输出一个进度条
+        
+        Args:
+            iterable: 待迭代对象
+            total: 总数，iterable 没有长度时需要提供
+        
+        Returns:
+            安装了 tqdm 时返回进度条迭代器，否则原样返回
+        """
+        if tqdm is None:
+            return iterable
+        return tqdm(iterable, total=total, desc="下载日线数据", unit="日")
+    
     def _has_local_data(self, trade_date: str) -> bool:
         """检查本地是否已有指定日期的数据"""
         try:
-            conn = self.db_manager.connect()
-            cursor = conn.cursor()
-            
-            # 转换日期格式
-            formatted_date = f"{trade_date[:4]}-{trade_date[4:6]}-{trade_date[6:8]}"
-            
-            query = """
-            SELECT COUNT(*) as count
-            FROM daily_data 
-            WHERE trade_date = ?
-            """
-            
-            cursor.execute(query, (formatted_date,))
-            result = cursor.fetchone()
-            count = result[0] if result else 0
+            conn = self._get_connection()
             
-            conn.close()
-            
-            return count > 0
+            # 只需判断是否存在，找到第一行即可返回
+            return conn.execute(_HAS_DATE_SQL, (_to_db_date(trade_date),)).fetchone() is not None
             
         except Exception as e:
-            print(f"❌ 检查本地数据失败: {e}")
+            self.logger.error("检查本地数据失败: %s", e)
             return False
     
     def _load_local_data(self, trade_date: str) -> pd.DataFrame:
-        """从本地数据库加载指定日期的数据"""
+        """
+        从本地加载指定日期的数据
+        
+        启用Parquet快照缓存时，先按当日数据版本查找快照，命中则直接读取；
+        未命中时从数据库查询，并写入新的快照供下次使用。
+        """
         try:
-            conn = self.db_manager.connect()
-            
-            # 转换日期格式
-            formatted_date = f"{trade_date[:4]}-{trade_date[4:6]}-{trade_date[6:8]}"
-            
-            query = """
-            SELECT * FROM daily_data 
-            WHERE trade_date = ?
-            ORDER BY ts_code
-            """
-            
-            data = pd.read_sql_query(query, conn, params=(formatted_date,))
-            conn.close()
+            conn = self._get_connection()
+            formatted_date = _to_db_date(trade_date)
+            
+            cache_file = None
+            if self.parquet_cache_dir is not None:
+                row = conn.execute(_DATE_VERSION_SQL, (formatted_date,)).fetchone()
+                version = row[0] if row else 0
+                cache_file = self.parquet_cache_dir / f"daily_{trade_date}_v{version}.parquet"
+                if cache_file.exists():
+                    try:
+                        data = _compact_strings(pd.read_parquet(cache_file))
+                        # 更新修改时间，清理时按最近使用保留
+                        os.utime(cache_file)
+                        self.stats['cache_hits'] += 1
+                        return data
+                    except Exception as e:
+                        self.logger.warning("读取Parquet快照失败，改为查询数据库: %s", e)
+            
+            data = _compact_strings(
+                pd.read_sql_query(_LOAD_DATE_SQL, conn, params=(formatted_date,))
+            )
+            
+            if cache_file is not None and not data.empty:
+                self._write_parquet_snapshot(trade_date, cache_file, data)
             
             self.stats['cache_hits'] += 1
             return data
             
         except Exception as e:
-            print(f"❌ 加载本地数据失败: {e}")
+            self.logger.error("加载本地数据失败: %s", e)
             return pd.DataFrame()
     
+    def _write_parquet_snapshot(self, trade_date: str, cache_file: Path, data: pd.DataFrame):
+        """
+        写入某日数据的Parquet快照，删除该日期的旧快照，并清理超出数量上限的快照
+        
+        先写入临时文件再替换，读取方不会看到写了一半的文件。
+        
+        Args:
+            trade_date: 交易日期 (YYYYMMDD格式)
+            cache_file: 快照文件路径（文件名包含当日数据版本）
+            data: 当日数据
+        """
+        try:
+            self.parquet_cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale_file in self.parquet_cache_dir.glob(f"daily_{trade_date}_*.parquet"):
+                stale_file.unlink()
+            
+            tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+            data.to_parquet(tmp_file, compression='snappy', index=False)
+            os.replace(tmp_file, cache_file)
+            
+            self._prune_parquet_cache()
+            
+        except Exception as e:
+            self.logger.warning("写入Parquet快照失败: %s", e)
+    
+    def _prune_parquet_cache(self):
+        """快照文件超过数量上限时，删除最久未使用的快照"""
+        cache_files = list(self.parquet_cache_dir.glob("daily_*.parquet"))
+        excess = len(cache_files) - self.parquet_cache_max_files
+        if excess <= 0:
+            return
+        
+        cache_files.sort(key=lambda cache_file: cache_file.stat().st_mtime)
+        for cache_file in cache_files[:excess]:
+            cache_file.unlink(missing_ok=True)
+    
     def _save_to_database(self, daily_data: pd.DataFrame):
         """保存日线数据到数据库"""
         try:
-            conn = self.db_manager.connect()
-            
-            # 使用INSERT OR REPLACE避免重复数据
-            for _, row in daily_data.iterrows():
-                query = """
-                INSERT OR REPLACE INTO daily_data 
-                (ts_code, trade_date, open, high, low, close, pre_close, 
-                 change, pct_chg, vol, amount)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-                
-                cursor = conn.cursor()
-                cursor.execute(query, (
-                    row['ts_code'],
-                    row['trade_date'],
-                    row.get('open'),
-                    row.get('high'),
-                    row.get('low'),
-                    row.get('close'),
-                    row.get('pre_close'),
-                    row.get('change'),
-                    row.get('pct_chg'),
-                    row.get('vol'),
-                    row.get('amount')
-                ))
-            
-            conn.commit()
-            conn.close()
+            # 缺失的列补为NaN；数值列一次性转换为float64矩阵（对应表中REAL列），
+            # 再整体转为Python对象，NaN写入为NULL
+            frame = daily_data.reindex(columns=_DAILY_DATA_COLUMNS)
+            numbers = frame[_NUMERIC_COLUMNS].to_numpy(dtype='float64')
+            values = numbers.astype(object)
+            values[np.isnan(numbers)] = None
+            rows = list(zip(frame['ts_code'].tolist(), frame['trade_date'].tolist(), *values.T.tolist()))
+            
+            conn = self._get_connection()
+            
+            # 使用INSERT OR REPLACE避免重复数据，整批数据在同一事务中写入；
+            # 每条语句插入多行（VALUES (...),(...)），减少语句执行次数
+            with conn:
+                for start in range(0, len(rows), _ROWS_PER_INSERT):
+                    chunk = rows[start:start + _ROWS_PER_INSERT]
+                    sql = _FULL_INSERT_SQL if len(chunk) == _ROWS_PER_INSERT else _build_insert_sql(len(chunk))
+                    conn.execute(sql, [value for row in chunk for value in row])
             
         except Exception as e:
-            print(f"❌ 保存数据到数据库失败: {e}")
+            self.logger.error("保存数据到数据库失败: %s", e)
     
     def _get_trade_dates_between(self, start_date: str, end_date: str, max_days: int) -> List[str]:
         """获取指定日期范围内的交易日列表"""
         try:
-            # 使用API管理器获取交易日期
-            all_dates = []
-            
             # 转换日期格式
             start_dt = datetime.strptime(start_date, '%Y%m%d')
             end_dt = datetime.strptime(end_date, '%Y%m%d')
@@ -280,76 +585,65 @@ class DailyDataManager:
             # 限制最大天数
             if (end_dt - start_dt).days > max_days:
                 end_dt = start_dt + timedelta(days=max_days)
-                print(f"⚠️  限制最大天数为 {max_days} 天")
-            
-            # 生成日期列表
-            current_date = start_dt
-            while current_date <= end_dt:
-                date_str = current_date.strftime('%Y%m%d')
-                formatted_date = current_date.strftime('%Y-%m-%d')
-                
-                if self.api_manager.is_trade_date(formatted_date):
-                    all_dates.append(date_str)
-                current_date += timedelta(days=1)
+                self.logger.warning("限制最大天数为 %d 天", max_days)
             
-            return all_dates
+            # 使用API管理器一次获取整个范围内的交易日期
+            trade_dates = self.api_manager.get_trade_dates(
+                start_dt.strftime('%Y-%m-%d'), end_dt.strftime('%Y-%m-%d')
+            )
+            return [date.replace('-', '') for date in trade_dates]
             
         except Exception as e:
-            print(f"❌ 获取交易日期失败: {e}")
+            self.logger.error("获取交易日期失败: %s", e)
             return []
     
     def _get_existing_dates(self, trade_dates: List[str]) -> Set[str]:
         """获取已存在数据的交易日期"""
         try:
-            conn = self.db_manager.connect()
-            cursor = conn.cursor()
+            conn = self._get_connection()
             
-            # 转换日期格式
-            formatted_dates = [f"{d[:4]}-{d[4:6]}-{d[6:8]}" for d in trade_dates]
-            
-            # 构建查询语句
-            placeholders = ','.join(['?' for _ in formatted_dates])
-            query = f"""
-            SELECT DISTINCT trade_date
-            FROM daily_data 
-            WHERE trade_date IN ({placeholders})
-            """
-            
-            cursor.execute(query, formatted_dates)
-            results = cursor.fetchall()
+            # 库中日期 -> 调用方日期，查询结果直接映射回原格式
+            date_map = {_to_db_date(d): d for d in trade_dates}
             
-            conn.close()
+            # 候选日期写入临时表再关联查询，不受SQLite绑定参数数量上限限制；
+            # EXISTS 子查询借助 trade_date 索引，每个日期找到一行即停止
+            with conn:
+                conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS candidate_dates (trade_date TEXT PRIMARY KEY)"
+                )
+                conn.execute("DELETE FROM candidate_dates")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO candidate_dates (trade_date) VALUES (?)",
+                    [(d,) for d in date_map]
+                )
             
-            # 转换回原格式
-            existing_dates = set()
-            for result in results:
-                date_str = result[0].replace('-', '')
-                existing_dates.add(date_str)
+            query = """
+            SELECT c.trade_date
+            FROM candidate_dates c
+            WHERE EXISTS (
+                SELECT 1 FROM daily_data d WHERE d.trade_date = c.trade_date
+            )
+            """
             
-            return existing_dates
+            return {date_map[row[0]] for row in conn.execute(query)}
             
         except Exception as e:
-            print(f"❌ 检查已存在数据失败: {e}")
+            self.logger.error("检查已存在数据失败: %s", e)
             return set()
     
     def _get_result_summary(self) -> Dict:
         """获取结果摘要"""
+        stats = self.stats
+        start_time, end_time = stats['start_time'], stats['end_time']
+        
         duration = None
-        if self.stats['start_time'] and self.stats['end_time']:
-            duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
-        
-        summary = {
-            'total_dates_processed': self.stats['total_dates_processed'],
-            'total_records_downloaded': self.stats['total_records_downloaded'],
-            'successful_dates': self.stats['successful_dates'],
-            'failed_dates': self.stats['failed_dates'],
-            'skipped_dates': self.stats['skipped_dates'],
-            'api_calls_made': self.stats['api_calls_made'],
-            'cache_hits': self.stats['cache_hits'],
-            'duration_seconds': duration,
-            'start_time': self.stats['start_time'],
-            'end_time': self.stats['end_time']
-        }
+        if start_time and end_time:
+            duration = (end_time - start_time).total_seconds()
+        
+        summary = {key: stats[key] for key in _STAT_COUNTERS}
+        summary['duration_seconds'] = duration
+        summary['start_time'] = start_time
+        summary['end_time'] = end_time
         
         # 打印摘要
         print(f"✅ 成功处理: {summary['successful_dates']} 个交易日")
@@ -377,13 +671,13 @@ class DailyDataManager:
             pd.DataFrame: 股票日线数据
         """
         try:
-            conn = self.db_manager.connect()
+            conn = self._get_connection()
             
             # 转换日期格式
-            start_formatted = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:8]}"
+            start_formatted = _to_db_date(start_date)
             
             if end_date:
-                end_formatted = f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:8]}"
+                end_formatted = _to_db_date(end_date)
                 query = """
                 SELECT * FROM daily_data 
                 WHERE ts_code = ? AND trade_date >= ? AND trade_date <= ?
@@ -398,13 +692,12 @@ class DailyDataManager:
                 """
                 params = (ts_code, start_formatted)
             
-            data = pd.read_sql_query(query, conn, params=params)
-            conn.close()
+            data = _compact_strings(pd.read_sql_query(query, conn, params=params))
             
             return data
             
         except Exception as e:
-            print(f"❌ 获取股票日线数据失败: {e}")
+            self.logger.error("获取股票日线数据失败: %s", e)
             return pd.DataFrame()
     
     def get_statistics(self) -> Dict:
@@ -419,30 +712,16 @@ class DailyDataManager:
         
         # 数据库统计
         try:
-            conn = self.db_manager.connect()
-            cursor = conn.cursor()
+            conn = self._get_connection()
             
-            # 总记录数
-            cursor.execute("SELECT COUNT(*) FROM daily_data")
-            total_records = cursor.fetchone()[0]
-            
-            # 股票数量
-            cursor.execute("SELECT COUNT(DISTINCT ts_code) FROM daily_data")
-            total_stocks = cursor.fetchone()[0]
-            
-            # 交易日数量
-            cursor.execute("SELECT COUNT(DISTINCT trade_date) FROM daily_data")
-            total_dates = cursor.fetchone()[0]
-            
-            # 最新日期
-            cursor.execute("SELECT MAX(trade_date) FROM daily_data")
-            latest_date = cursor.fetchone()[0]
-            
-            # 最旧日期
-            cursor.execute("SELECT MIN(trade_date) FROM daily_data")
-            earliest_date = cursor.fetchone()[0]
-            
-            conn.close()
+            # 记录数、股票数、交易日数及日期范围在一次扫描中统计
+            total_records, total_stocks, total_dates, earliest_date, latest_date = conn.execute(
+                """
+                SELECT COUNT(*), COUNT(DISTINCT ts_code), COUNT(DISTINCT trade_date),
+                       MIN(trade_date), MAX(trade_date)
+                FROM daily_data
+                """
+            ).fetchone()
             
             print(f"📊 总记录数: {total_records:,}")
             print(f"📈 股票数量: {total_stocks}")
@@ -480,6 +759,12 @@ def main():
     
     args = parser.parse_args()
     
+    # 设置日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     try:
         # 初始化配置和管理器
         config = ConfigManager()
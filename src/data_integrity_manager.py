@@ -6,15 +6,143 @@
 """
 
 import sqlite3
-import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime, timedelta
-import json
+from typing import Dict, List, Tuple, Any, Iterator, Callable
+from datetime import datetime
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
 from .database_manager import DatabaseManager
 from .config_manager import ConfigManager
+from .json_utils import dumps, loads
+
+
+# 重复与关联检查依赖的索引：(表名, 索引列, 缺失时创建的索引名)
+# 已有以这些列开头的索引（含主键、唯一约束自动创建的索引）时不再重复创建
+_REQUIRED_INDEXES = (
+    ('daily_data', ('ts_code', 'trade_date'), 'idx_daily_data_ts_code_date'),
+    ('stocks', ('ts_code',), 'idx_stocks_ts_code'),
+    ('download_status', ('ts_code',), 'idx_download_status_ts_code'),
+)
+
+# 关联完整性检查语句
+_ORPHAN_DAILY_DATA_SQL = """
+SELECT COUNT(DISTINCT dd.ts_code)
+FROM daily_data dd
+WHERE NOT EXISTS (SELECT 1 FROM stocks s WHERE s.ts_code = dd.ts_code)
+"""
+
+_STOCKS_WITHOUT_DATA_SQL = """
+SELECT COUNT(*)
+FROM stocks s
+WHERE s.ts_code IS NOT NULL
+AND NOT EXISTS (SELECT 1 FROM daily_data dd WHERE dd.ts_code = s.ts_code)
+"""
+
+_ORPHAN_DOWNLOAD_STATUS_SQL = """
+SELECT COUNT(*)
+FROM download_status ds
+WHERE ds.ts_code IS NOT NULL
+AND NOT EXISTS (SELECT 1 FROM stocks s WHERE s.ts_code = ds.ts_code)
+"""
+
+# 重复记录检查语句：重复分组与其中的具体记录在一次查询中取出，按分组顺序排列
+_DAILY_DATA_DUPLICATES_SQL = """
+SELECT d.id, d.ts_code, d.trade_date, d.open, d.high, d.low, d.close,
+       d.vol, d.amount, d.created_at
+FROM daily_data d
+JOIN (
+    SELECT ts_code, trade_date
+    FROM daily_data
+    GROUP BY ts_code, trade_date
+    HAVING COUNT(*) > 1
+) g ON d.ts_code IS g.ts_code AND d.trade_date IS g.trade_date
+ORDER BY d.ts_code, d.trade_date, d.id
+"""
+
+_STOCKS_DUPLICATES_SQL = """
+SELECT s.ts_code, s.symbol, s.name, s.area, s.industry, s.list_date,
+       s.market, s.created_at, s.updated_at
+FROM stocks s
+JOIN (
+    SELECT ts_code
+    FROM stocks
+    GROUP BY ts_code
+    HAVING COUNT(*) > 1
+) g ON s.ts_code IS g.ts_code
+ORDER BY s.ts_code, s.created_at, s.rowid
+"""
+
+# 各表判定重复的键列
+_DUPLICATE_KEY_COLUMNS = {
+    'daily_data': ('ts_code', 'trade_date'),
+    'stocks': ('ts_code',),
+}
+
+# 日线数据增量检查：system_config 中保存上次检查到的最大 id（水位）及当时的统计结果
+_DAILY_DATA_WATERMARK_KEY = 'integrity_watermark_daily_data'
+_DAILY_DATA_SNAPSHOT_KEY = 'integrity_snapshot_daily_data'
+
+# 水位以下的记录被就地更新（含 ON CONFLICT DO UPDATE 与修复操作）时作废水位；
+# 删除（含 INSERT OR REPLACE 的替换）不触发 UPDATE 触发器，由检查时的总行数比对发现
+_WATERMARK_TRIGGER_SQL = f"""
+CREATE TRIGGER IF NOT EXISTS invalidate_daily_data_watermark
+AFTER UPDATE ON daily_data
+FOR EACH ROW
+WHEN OLD.id <= (
+    SELECT CAST(value AS INTEGER) FROM system_config WHERE key = '{_DAILY_DATA_WATERMARK_KEY}'
+)
+BEGIN
+    DELETE FROM system_config WHERE key = '{_DAILY_DATA_WATERMARK_KEY}';
+END
+"""
+
+# 日线数据的总行数与最大 id
+_DAILY_DATA_EXTENT_SQL = """
+SELECT (SELECT COUNT(*) FROM daily_data), (SELECT COALESCE(MAX(id), 0) FROM daily_data)
+"""
+
+# 依赖索引逐条查找的语句及其中被查找表的别名；
+# 查询计划中该表变为全表扫描（SCAN）时说明索引缺失或未被使用
+_INDEXED_PROBES = (
+    (_ORPHAN_DAILY_DATA_SQL, 's'),
+    (_STOCKS_WITHOUT_DATA_SQL, 'dd'),
+    (_ORPHAN_DOWNLOAD_STATUS_SQL, 's'),
+)
+
+# 查询计划中的全表扫描，兼容 "SCAN s" 与旧版本的 "SCAN TABLE stocks AS s"
+_SCAN_PATTERN = re.compile(r'SCAN (?:TABLE )?(\w+)(?: AS (\w+))?')
+
+
+def _write_json(f, value: Any, level: int = 0):
+    """按 indent=2 格式写出 JSON，其中的迭代器逐项写出为数组而不整体物化
+    
+    Args:
+        f: 已打开的文本文件
+        value: 待写出的值，字典和迭代器递归处理，其余交给 dumps
+        level: 当前缩进层级
+    """
+    indent = '  ' * (level + 1)
+    if isinstance(value, dict) and value:
+        f.write('{')
+        for i, (key, item) in enumerate(value.items()):
+            f.write(f"{',' if i else ''}\n{indent}{dumps(key)}: ")
+            _write_json(f, item, level + 1)
+        f.write(f"\n{'  ' * level}}}")
+    elif isinstance(value, Iterator):
+        f.write('[')
+        empty = True
+        for item in value:
+            f.write(f"{'' if empty else ','}\n{indent}")
+            _write_json(f, item, level + 1)
+            empty = False
+        f.write(']' if empty else f"\n{'  ' * level}]")
+    else:
+        f.write(dumps(value).replace('\n', '\n' + '  ' * level))
 
 
 class DataIntegrityManager:
@@ -35,14 +163,116 @@ class DataIntegrityManager:
         self.config = config_manager
         # 从配置管理器获取数据库路径
         db_path = self.config.get('database.path', 'data/stock_data.db')
-        self.db_manager = DatabaseManager(db_path)
+        self.db_manager = DatabaseManager(
+            db_path, self.config.get('database.synchronous', 'NORMAL')
+        )
         self.logger = logging.getLogger(__name__)
+        self._indexes_ensured = False
+        # 是否启用日线数据增量检查，首次检查时确定
+        self._watermark_enabled = None
+    
+    def _ensure_indexes(self):
+        """确保重复与关联检查所需的索引存在
         
-        # 配置日志
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        由 database_init.sql 初始化的数据库已包含这些索引；
+        其他方式创建的数据库缺少时补建，每个实例只检查一次。
+        """
+        if self._indexes_ensured:
+            return
+        self._indexes_ensured = True
+        
+        for table, columns, index_name in _REQUIRED_INDEXES:
+            try:
+                if self._has_index_on(table, columns):
+                    continue
+                
+                self.db_manager.execute_update(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({', '.join(columns)})"
+                )
+                self.logger.info("已创建索引: %s", index_name)
+                
+            except sqlite3.Error as e:
+                self.logger.warning("创建索引 %s 失败: %s", index_name, e)
+        
+        self._verify_query_plans()
+    
+    def _ensure_watermark_trigger(self):
+        """确保作废增量检查水位的触发器存在
+        
+        触发器依赖 system_config 表，缺少该表的数据库不启用增量检查，
+        每个实例只检查一次。
+        """
+        if self._watermark_enabled is not None:
+            return
+        self._watermark_enabled = False
+        
+        try:
+            if not self.db_manager.execute_query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'system_config'"
+            ):
+                return
+            
+            self.db_manager.execute_update(_WATERMARK_TRIGGER_SQL)
+            self._watermark_enabled = True
+            
+        except sqlite3.Error as e:
+            self.logger.warning("创建增量检查触发器失败: %s", e)
+    
+    def _verify_query_plans(self):
+        """检查依赖索引的语句是否确实按索引查找
+        
+        对每条语句执行 EXPLAIN QUERY PLAN，被查找的表出现全表扫描时记录警告，
+        便于及早发现索引缺失导致的检查变慢。
+        """
+        for query, probed_alias in _INDEXED_PROBES:
+            try:
+                plan = self.db_manager.execute_query(f"EXPLAIN QUERY PLAN {query}")
+            except sqlite3.Error as e:
+                self.logger.warning("获取查询计划失败: %s", e)
+                continue
+            
+            for row in plan:
+                match = _SCAN_PATTERN.match(row['detail'])
+                if match and probed_alias in match.groups():
+                    self.logger.warning("查询未使用索引，将逐行全表扫描: %s", row['detail'])
+    
+    def _has_index_on(self, table: str, columns: Tuple[str, ...]) -> bool:
+        """判断表上是否已有以指定列开头的索引"""
+        for index in self.db_manager.execute_query(f"PRAGMA index_list({table})"):
+            index_columns = self.db_manager.execute_query(f"PRAGMA index_info({index['name']})")
+            leading = tuple(col['name'] for col in sorted(index_columns, key=lambda c: c['seqno']))
+            if leading[:len(columns)] == columns:
+                return True
+        return False
+    
+    def _has_unique_keys(self, table: str) -> bool:
+        """判断表结构是否保证重复检查的键列没有重复
+        
+        存在列全部属于键列的唯一索引（含主键、唯一约束）时，键列组合必然唯一。
+        但 SQLite 的唯一约束不限制空值，而重复检查用 IS 把空值视为相同，
+        因此可空的键列中存在空值时仍需完整检查。
+        """
+        key_columns = _DUPLICATE_KEY_COLUMNS[table]
+        
+        for index in self.db_manager.execute_query(f"PRAGMA index_list({table})"):
+            if not index['unique'] or index['partial']:
+                continue
+            index_columns = self.db_manager.execute_query(f"PRAGMA index_info({index['name']})")
+            if index_columns and all(col['name'] in key_columns for col in index_columns):
+                break
+        else:
+            return False
+        
+        nullable = [
+            col['name'] for col in self.db_manager.execute_query(f"PRAGMA table_info({table})")
+            if col['name'] in key_columns and not col['notnull']
+        ]
+        if not nullable:
+            return True
+        
+        condition = ' OR '.join(f"{column} IS NULL" for column in nullable)
+        result = self.db_manager.execute_query(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE {condition})")
+        return not result[0][0]
     
     def check_duplicate_records(self, table_name: str) -> Dict[str, Any]:
         """检查重复记录
@@ -54,6 +284,17 @@ class DataIntegrityManager:
             检查结果字典
         """
         try:
+            self._ensure_indexes()
+            
+            if table_name in _DUPLICATE_KEY_COLUMNS and self._has_unique_keys(table_name):
+                # 表结构已保证没有重复记录，无需分组扫描
+                return {
+                    'success': True,
+                    'table': table_name,
+                    'total_duplicates': 0,
+                    'duplicates': []
+                }
+            
             if table_name == 'daily_data':
                 # 检查日线数据表的重复记录
                 return self._check_daily_data_duplicates()
@@ -64,7 +305,7 @@ class DataIntegrityManager:
                 raise ValueError(f"不支持的表名: {table_name}")
                 
         except Exception as e:
-            self.logger.error(f"检查重复记录失败: {e}")
+            self.logger.error("检查重复记录失败: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -73,45 +314,18 @@ class DataIntegrityManager:
     
     def _check_daily_data_duplicates(self) -> Dict[str, Any]:
         """检查日线数据表的重复记录"""
-        query = """
-        SELECT ts_code, trade_date, COUNT(*) as count
-        FROM daily_data
-        GROUP BY ts_code, trade_date
-        HAVING COUNT(*) > 1
-        ORDER BY ts_code, trade_date
-        """
-        
         try:
-            duplicates = self.db_manager.execute_query(query)
-            
-            # 获取具体的重复记录详情
-            duplicate_details = []
-            for row in duplicates:
-                ts_code, trade_date, count = row
-                detail_query = """
-                SELECT id, ts_code, trade_date, open, high, low, close, 
-                       vol, amount, created_at
-                FROM daily_data
-                WHERE ts_code = ? AND trade_date = ?
-                ORDER BY id
-                """
-                records = self.db_manager.execute_query(detail_query, (ts_code, trade_date))
-                duplicate_details.append({
-                    'ts_code': ts_code,
-                    'trade_date': trade_date,
-                    'count': count,
-                    'records': records
-                })
+            duplicate_details = list(self._iter_daily_data_duplicates())
             
             return {
                 'success': True,
                 'table': 'daily_data',
-                'total_duplicates': len(duplicates),
+                'total_duplicates': len(duplicate_details),
                 'duplicates': duplicate_details
             }
             
         except Exception as e:
-            self.logger.error(f"检查日线数据重复记录失败: {e}")
+            self.logger.error("检查日线数据重复记录失败: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -120,49 +334,79 @@ class DataIntegrityManager:
     
     def _check_stocks_duplicates(self) -> Dict[str, Any]:
         """检查股票基本信息表的重复记录"""
-        # 检查ts_code重复
-        query = """
-        SELECT ts_code, COUNT(*) as count
-        FROM stocks
-        GROUP BY ts_code
-        HAVING COUNT(*) > 1
-        """
-        
         try:
-            duplicates = self.db_manager.execute_query(query)
-            
-            duplicate_details = []
-            for row in duplicates:
-                ts_code, count = row
-                detail_query = """
-                SELECT ts_code, symbol, name, area, industry, list_date, 
-                       market, created_at, updated_at
-                FROM stocks
-                WHERE ts_code = ?
-                ORDER BY created_at
-                """
-                records = self.db_manager.execute_query(detail_query, (ts_code,))
-                duplicate_details.append({
-                    'ts_code': ts_code,
-                    'count': count,
-                    'records': records
-                })
+            duplicate_details = list(self._iter_stocks_duplicates())
             
             return {
                 'success': True,
                 'table': 'stocks',
-                'total_duplicates': len(duplicates),
+                'total_duplicates': len(duplicate_details),
                 'duplicates': duplicate_details
             }
             
         except Exception as e:
-            self.logger.error(f"检查股票信息重复记录失败: {e}")
+            self.logger.error("检查股票信息重复记录失败: %s", e)
             return {
                 'success': False,
                 'error': str(e),
                 'duplicates': []
             }
     
+    def _iter_duplicates(self, table_name: str) -> Iterator[Dict[str, Any]]:
+        """按表名逐组生成重复记录详情"""
+        if table_name == 'daily_data':
+            return self._iter_daily_data_duplicates()
+        elif table_name == 'stocks':
+            return self._iter_stocks_duplicates()
+        raise ValueError(f"不支持的表名: {table_name}")
+    
+    def _iter_daily_data_duplicates(self) -> Iterator[Dict[str, Any]]:
+        """逐组生成日线数据表的重复记录详情"""
+        rows = self.db_manager.iter_query(_DAILY_DATA_DUPLICATES_SQL)
+        for (ts_code, trade_date), group in groupby(rows, key=itemgetter('ts_code', 'trade_date')):
+            records = [dict(row) for row in group]
+            yield {
+                'ts_code': ts_code,
+                'trade_date': trade_date,
+                'count': len(records),
+                'records': records
+            }
+    
+    def _iter_stocks_duplicates(self) -> Iterator[Dict[str, Any]]:
+        """逐组生成股票基本信息表的重复记录详情"""
+        rows = self.db_manager.iter_query(_STOCKS_DUPLICATES_SQL)
+        for ts_code, group in groupby(rows, key=itemgetter('ts_code')):
+            records = [dict(row) for row in group]
+            yield {
+                'ts_code': ts_code,
+                'count': len(records),
+                'records': records
+            }
+    
+    def _count_duplicate_groups(self, table_name: str) -> Dict[str, Any]:
+        """只统计重复分组数量，不取出具体记录"""
+        try:
+            if self._has_unique_keys(table_name):
+                return {'success': True, 'table': table_name, 'total_duplicates': 0}
+            
+            key_columns = ', '.join(_DUPLICATE_KEY_COLUMNS[table_name])
+            result = self.db_manager.execute_query(f"""
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM {table_name} GROUP BY {key_columns} HAVING COUNT(*) > 1
+            )
+            """)
+            return {
+                'success': True,
+                'table': table_name,
+                'total_duplicates': result[0][0] if result else 0
+            }
+        except Exception as e:
+            self.logger.error("统计重复记录失败: %s", e)
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def remove_duplicate_records(self, table_name: str, 
                                strategy: str = 'keep_latest') -> Dict[str, Any]:
         """移除重复记录
@@ -175,6 +419,8 @@ class DataIntegrityManager:
             操作结果
         """
         try:
+            self._ensure_indexes()
+            
             if table_name == 'daily_data':
                 return self._remove_daily_data_duplicates(strategy)
             elif table_name == 'stocks':
@@ -183,7 +429,7 @@ class DataIntegrityManager:
                 raise ValueError(f"不支持的表名: {table_name}")
                 
         except Exception as e:
-            self.logger.error(f"移除重复记录失败: {e}")
+            self.logger.error("移除重复记录失败: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -192,57 +438,14 @@ class DataIntegrityManager:
     
     def _remove_daily_data_duplicates(self, strategy: str) -> Dict[str, Any]:
         """移除日线数据重复记录"""
-        if strategy == 'keep_latest':
-            # 保留最新插入的记录（ID最大）
-            query = """
-            DELETE FROM daily_data
-            WHERE id NOT IN (
-                SELECT MAX(id)
-                FROM daily_data
-                GROUP BY ts_code, trade_date
-            )
-            """
-        elif strategy == 'keep_first':
-            # 保留最早插入的记录（ID最小）
-            query = """
-            DELETE FROM daily_data
-            WHERE id NOT IN (
-                SELECT MIN(id)
-                FROM daily_data
-                GROUP BY ts_code, trade_date
-            )
-            """
-        else:
-            raise ValueError(f"不支持的去重策略: {strategy}")
+        # 保留最新插入（ID最大）或最早插入（ID最小）的记录
+        keep_func = self._get_keep_function(strategy)
         
         try:
-            # 先检查将要删除的记录数
-            count_query = """
-            SELECT COUNT(*)
-            FROM daily_data
-            WHERE id NOT IN (
-                SELECT MAX(id)
-                FROM daily_data
-                GROUP BY ts_code, trade_date
-            )
-            """ if strategy == 'keep_latest' else """
-            SELECT COUNT(*)
-            FROM daily_data
-            WHERE id NOT IN (
-                SELECT MIN(id)
-                FROM daily_data
-                GROUP BY ts_code, trade_date
-            )
-            """
-            
-            result = self.db_manager.execute_query(count_query)
-            duplicate_count = result[0][0] if result else 0
+            duplicate_count = self._delete_duplicates('daily_data', 'id', 'ts_code, trade_date', keep_func)
             
             if duplicate_count > 0:
-                # 执行删除
-                self.db_manager.execute_update(query)
-                
-                self.logger.info(f"移除了 {duplicate_count} 条重复的日线数据记录")
+                self.logger.info("移除了 %d 条重复的日线数据记录", duplicate_count)
                 
                 return {
                     'success': True,
@@ -260,7 +463,7 @@ class DataIntegrityManager:
                 }
                 
         except Exception as e:
-            self.logger.error(f"移除日线数据重复记录失败: {e}")
+            self.logger.error("移除日线数据重复记录失败: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -269,57 +472,14 @@ class DataIntegrityManager:
     
     def _remove_stocks_duplicates(self, strategy: str) -> Dict[str, Any]:
         """移除股票信息重复记录"""
-        if strategy == 'keep_latest':
-            # 保留最新更新的记录
-            query = """
-            DELETE FROM stocks
-            WHERE rowid NOT IN (
-                SELECT MAX(rowid)
-                FROM stocks
-                GROUP BY ts_code
-            )
-            """
-        elif strategy == 'keep_first':
-            # 保留最早创建的记录
-            query = """
-            DELETE FROM stocks
-            WHERE rowid NOT IN (
-                SELECT MIN(rowid)
-                FROM stocks
-                GROUP BY ts_code
-            )
-            """
-        else:
-            raise ValueError(f"不支持的去重策略: {strategy}")
+        # 保留最新更新或最早创建的记录
+        keep_func = self._get_keep_function(strategy)
         
         try:
-            # 先检查将要删除的记录数
-            count_query = """
-            SELECT COUNT(*)
-            FROM stocks
-            WHERE rowid NOT IN (
-                SELECT MAX(rowid)
-                FROM stocks
-                GROUP BY ts_code
-            )
-            """ if strategy == 'keep_latest' else """
-            SELECT COUNT(*)
-            FROM stocks
-            WHERE rowid NOT IN (
-                SELECT MIN(rowid)
-                FROM stocks
-                GROUP BY ts_code
-            )
-            """
-            
-            result = self.db_manager.execute_query(count_query)
-            duplicate_count = result[0][0] if result else 0
+            duplicate_count = self._delete_duplicates('stocks', 'rowid', 'ts_code', keep_func)
             
             if duplicate_count > 0:
-                # 执行删除
-                self.db_manager.execute_update(query)
-                
-                self.logger.info(f"移除了 {duplicate_count} 条重复的股票信息记录")
+                self.logger.info("移除了 %d 条重复的股票信息记录", duplicate_count)
                 
                 return {
                     'success': True,
@@ -337,13 +497,66 @@ class DataIntegrityManager:
                 }
                 
         except Exception as e:
-            self.logger.error(f"移除股票信息重复记录失败: {e}")
+            self.logger.error("移除股票信息重复记录失败: %s", e)
             return {
                 'success': False,
                 'error': str(e),
                 'removed_count': 0
             }
     
+    @staticmethod
+    def _get_keep_function(strategy: str) -> str:
+        """根据去重策略返回选择保留记录的聚合函数"""
+        if strategy == 'keep_latest':
+            return 'MAX'
+        elif strategy == 'keep_first':
+            return 'MIN'
+        else:
+            raise ValueError(f"不支持的去重策略: {strategy}")
+    
+    def _delete_duplicates(self, table: str, id_column: str, key_columns: str, keep_func: str) -> int:
+        """删除重复记录，每组只保留一条
+        
+        每组要保留的记录ID只分组计算一次，写入以ID为主键的临时表；
+        统计与删除都对照该临时表进行，不再各自执行一遍 GROUP BY。
+        全部语句在同一事务中执行，出错时连同临时表一起回滚。
+        
+        Args:
+            table: 表名
+            id_column: 记录ID列（id 或 rowid）
+            key_columns: 判断重复的列，逗号分隔
+            keep_func: 选择保留记录的聚合函数（MAX 或 MIN）
+            
+        Returns:
+            删除的记录数
+        """
+        with self.db_manager.transaction():
+            self.db_manager.execute_update("DROP TABLE IF EXISTS temp.keep_ids")
+            self.db_manager.execute_update("CREATE TEMP TABLE keep_ids (id INTEGER PRIMARY KEY)")
+            
+            self.db_manager.execute_update(f"""
+            INSERT INTO keep_ids
+            SELECT {keep_func}({id_column})
+            FROM {table}
+            GROUP BY {key_columns}
+            """)
+            
+            # 重复记录数 = 总记录数 - 保留的记录数
+            result = self.db_manager.execute_query(
+                f"SELECT (SELECT COUNT(*) FROM {table}) - (SELECT COUNT(*) FROM keep_ids)"
+            )
+            duplicate_count = result[0][0] if result else 0
+            
+            if duplicate_count > 0:
+                self.db_manager.execute_update(f"""
+                DELETE FROM {table}
+                WHERE {id_column} NOT IN (SELECT id FROM keep_ids)
+                """)
+            
+            self.db_manager.execute_update("DROP TABLE temp.keep_ids")
+        
+        return duplicate_count
+    
     def check_data_integrity(self) -> Dict[str, Any]:
         """检查数据完整性
         
@@ -351,19 +564,28 @@ class DataIntegrityManager:
             完整性检查结果
         """
         try:
-            integrity_results = {}
-            
-            # 1. 检查股票基本信息表完整性
-            integrity_results['stocks'] = self._check_stocks_integrity()
-            
-            # 2. 检查日线数据表完整性
-            integrity_results['daily_data'] = self._check_daily_data_integrity()
+            self._ensure_indexes()
+            self._ensure_watermark_trigger()
             
-            # 3. 检查表之间的关联完整性
-            integrity_results['relationships'] = self._check_relationship_integrity()
+            probes = {
+                # 1. 检查股票基本信息表完整性
+                'stocks': self._check_stocks_integrity,
+                # 2. 检查日线数据表完整性
+                'daily_data': self._check_daily_data_integrity,
+                # 3. 检查表之间的关联完整性
+                'relationships': self._check_relationship_integrity,
+                # 4. 检查数据逻辑一致性
+                'logical_consistency': self._check_logical_consistency,
+            }
             
-            # 4. 检查数据逻辑一致性
-            integrity_results['logical_consistency'] = self._check_logical_consistency()
+            # 各项检查互不依赖，WAL 模式下可在各自的连接上并发执行；
+            # 只有日线数据检查会写入增量水位，写事务不阻塞其他连接的读取
+            with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+                futures = {
+                    name: executor.submit(self._run_probe, probe)
+                    for name, probe in probes.items()
+                }
+                integrity_results = {name: future.result() for name, future in futures.items()}
             
             return {
                 'success': True,
@@ -372,162 +594,226 @@ class DataIntegrityManager:
             }
             
         except Exception as e:
-            self.logger.error(f"数据完整性检查失败: {e}")
+            self.logger.error("数据完整性检查失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
             }
     
-    def _check_stocks_integrity(self) -> Dict[str, Any]:
+    def _run_probe(self, probe: Callable[[DatabaseManager], Dict[str, Any]]) -> Dict[str, Any]:
+        """在独立的数据库连接上执行一项检查
+        
+        sqlite3 连接不能在线程间交叉使用，每个检查线程单独打开并关闭自己的连接。
+        """
+        db = DatabaseManager(self.db_manager.db_path, self.db_manager.synchronous)
+        try:
+            return probe(db)
+        finally:
+            db.disconnect()
+    
+    def _check_stocks_integrity(self, db: DatabaseManager) -> Dict[str, Any]:
         """检查股票基本信息表完整性"""
         results = {}
         
         try:
             # 检查必填字段是否为空
             null_checks = [
-                ('ts_code', 'SELECT COUNT(*) FROM stocks WHERE ts_code IS NULL OR ts_code = ""'),
-                ('symbol', 'SELECT COUNT(*) FROM stocks WHERE symbol IS NULL OR symbol = ""'),
-                ('name', 'SELECT COUNT(*) FROM stocks WHERE name IS NULL OR name = ""'),
-                ('list_date', 'SELECT COUNT(*) FROM stocks WHERE list_date IS NULL OR list_date = ""')
+                ('ts_code', "ts_code IS NULL OR ts_code = ''"),
+                ('symbol', "symbol IS NULL OR symbol = ''"),
+                ('name', "name IS NULL OR name = ''"),
+                ('list_date', "list_date IS NULL OR list_date = ''")
             ]
             
-            results['null_fields'] = {}
-            for field, query in null_checks:
-                result = self.db_manager.execute_query(query)
-                count = result[0][0] if result else 0
-                results['null_fields'][field] = count
-            
-            # 检查日期格式
-            date_format_query = """
-            SELECT COUNT(*) FROM stocks 
-            WHERE list_date IS NOT NULL 
-            AND list_date != ""
-            AND NOT (
-                list_date GLOB '[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]'
-                OR list_date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
-            )
-            """
-            result = self.db_manager.execute_query(date_format_query)
-            results['invalid_date_format'] = result[0][0] if result else 0
-            
-            # 检查股票代码格式
-            code_format_query = """
-            SELECT COUNT(*) FROM stocks 
-            WHERE ts_code IS NOT NULL 
-            AND ts_code NOT GLOB '[0-9][0-9][0-9][0-9][0-9][0-9].[SZ|SH]'
-            """
-            result = self.db_manager.execute_query(code_format_query)
-            results['invalid_code_format'] = result[0][0] if result else 0
+            # 检查日期格式和股票代码格式
+            format_checks = [
+                ('invalid_date_format', """
+                    list_date IS NOT NULL
+                    AND list_date != ''
+                    AND NOT (
+                        list_date GLOB '[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]'
+                        OR list_date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+                    )
+                """),
+                ('invalid_code_format', """
+                    ts_code IS NOT NULL
+                    AND ts_code NOT GLOB '[0-9][0-9][0-9][0-9][0-9][0-9].S[ZH]'
+                """)
+            ]
+            
+            total_records, counts = self._count_matching_rows(db, 'stocks', null_checks + format_checks)
+            
+            results['null_fields'] = {field: counts[field] for field, _ in null_checks}
+            for check_name, _ in format_checks:
+                results[check_name] = counts[check_name]
             
             # 总记录数
-            total_query = "SELECT COUNT(*) FROM stocks"
-            result = self.db_manager.execute_query(total_query)
-            results['total_records'] = result[0][0] if result else 0
+            results['total_records'] = total_records
             
             return results
             
         except Exception as e:
-            self.logger.error(f"检查股票信息完整性失败: {e}")
+            self.logger.error("检查股票信息完整性失败: %s", e)
             return {'error': str(e)}
     
-    def _check_daily_data_integrity(self) -> Dict[str, Any]:
+    def _check_daily_data_integrity(self, db: DatabaseManager) -> Dict[str, Any]:
         """检查日线数据表完整性"""
         results = {}
         
         try:
             # 检查必填字段是否为空
             null_checks = [
-                ('ts_code', 'SELECT COUNT(*) FROM daily_data WHERE ts_code IS NULL OR ts_code = ""'),
-                ('trade_date', 'SELECT COUNT(*) FROM daily_data WHERE trade_date IS NULL OR trade_date = ""'),
-                ('open', 'SELECT COUNT(*) FROM daily_data WHERE open IS NULL'),
-                ('high', 'SELECT COUNT(*) FROM daily_data WHERE high IS NULL'),
-                ('low', 'SELECT COUNT(*) FROM daily_data WHERE low IS NULL'),
-                ('close', 'SELECT COUNT(*) FROM daily_data WHERE close IS NULL')
+                ('ts_code', "ts_code IS NULL OR ts_code = ''"),
+                ('trade_date', "trade_date IS NULL OR trade_date = ''"),
+                ('open', 'open IS NULL'),
+                ('high', 'high IS NULL'),
+                ('low', 'low IS NULL'),
+                ('close', 'close IS NULL')
             ]
             
-            results['null_fields'] = {}
-            for field, query in null_checks:
-                result = self.db_manager.execute_query(query)
-                count = result[0][0] if result else 0
-                results['null_fields'][field] = count
-            
             # 检查价格数据逻辑性
             price_logic_checks = [
-                ('negative_prices', 'SELECT COUNT(*) FROM daily_data WHERE open < 0 OR high < 0 OR low < 0 OR close < 0'),
-                ('invalid_high_low', 'SELECT COUNT(*) FROM daily_data WHERE high < low'),
-                ('invalid_open_range', 'SELECT COUNT(*) FROM daily_data WHERE open < low OR open > high'),
-                ('invalid_close_range', 'SELECT COUNT(*) FROM daily_data WHERE close < low OR close > high')
+                ('negative_prices', 'open < 0 OR high < 0 OR low < 0 OR close < 0'),
+                ('invalid_high_low', 'high < low'),
+                ('invalid_open_range', 'open < low OR open > high'),
+                ('invalid_close_range', 'close < low OR close > high')
             ]
             
-            results['price_logic_errors'] = {}
-            for check_name, query in price_logic_checks:
-                result = self.db_manager.execute_query(query)
-                count = result[0][0] if result else 0
-                results['price_logic_errors'][check_name] = count
-            
             # 检查交易量数据
             volume_checks = [
-                ('negative_volume', 'SELECT COUNT(*) FROM daily_data WHERE vol < 0'),
-                ('negative_amount', 'SELECT COUNT(*) FROM daily_data WHERE amount < 0'),
-                ('zero_volume_with_price', 'SELECT COUNT(*) FROM daily_data WHERE vol = 0 AND (open != close OR high != low)')
+                ('negative_volume', 'vol < 0'),
+                ('negative_amount', 'amount < 0'),
+                ('zero_volume_with_price', 'vol = 0 AND (open != close OR high != low)')
             ]
             
-            results['volume_errors'] = {}
-            for check_name, query in volume_checks:
-                result = self.db_manager.execute_query(query)
-                count = result[0][0] if result else 0
-                results['volume_errors'][check_name] = count
+            total_records, counts = self._count_daily_data_rows(
+                db, null_checks + price_logic_checks + volume_checks
+            )
+            
+            results['null_fields'] = {field: counts[field] for field, _ in null_checks}
+            results['price_logic_errors'] = {name: counts[name] for name, _ in price_logic_checks}
+            results['volume_errors'] = {name: counts[name] for name, _ in volume_checks}
             
             # 总记录数
-            total_query = "SELECT COUNT(*) FROM daily_data"
-            result = self.db_manager.execute_query(total_query)
-            results['total_records'] = result[0][0] if result else 0
+            results['total_records'] = total_records
             
             return results
             
         except Exception as e:
-            self.logger.error(f"检查日线数据完整性失败: {e}")
+            self.logger.error("检查日线数据完整性失败: %s", e)
             return {'error': str(e)}
     
-    def _check_relationship_integrity(self) -> Dict[str, Any]:
+    def _count_matching_rows(self, db: DatabaseManager, table: str,
+                             checks: List[Tuple[str, str]], where: str = None,
+                             params: tuple = None) -> Tuple[int, Dict[str, int]]:
+        """一次扫描统计表的总记录数及每个条件命中的记录数
+        
+        每个条件写成 SUM(条件) 聚合列，所有检查共用同一次全表扫描。
+        
+        Args:
+            db: 执行查询的数据库管理器
+            table: 表名
+            checks: (检查名, SQL条件) 列表
+            where: 限定统计范围的条件
+            params: where 条件的参数
+            
+        Returns:
+            (总记录数, 检查名 -> 命中记录数)
+        """
+        columns = ', '.join(f"COALESCE(SUM({condition}), 0)" for _, condition in checks)
+        query = f"SELECT COUNT(*), {columns} FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+        result = db.execute_query(query, params)
+        row = result[0]
+        
+        counts = {name: row[i] for i, (name, _) in enumerate(checks, 1)}
+        return row[0], counts
+    
+    def _count_daily_data_rows(self, db: DatabaseManager,
+                               checks: List[Tuple[str, str]]) -> Tuple[int, Dict[str, int]]:
+        """统计日线数据的总记录数及每个条件命中的记录数，尽量只扫描新增记录
+        
+        上次检查的结果连同当时的最大 id 保存在 system_config 中。水位以下的记录
+        既未被更新（触发器作废水位）也未被删除（总行数与上次结果加新增数一致）时，
+        只统计水位之后的记录并与上次结果相加，否则回退为全表统计。
+        
+        读取水位、统计与保存在同一写事务中完成，期间其他连接的写入需等待提交，
+        不会出现统计之后、保存之前的更新被覆盖掉的情况。
+        
+        Args:
+            db: 执行查询的数据库管理器
+            checks: (检查名, SQL条件) 列表
+            
+        Returns:
+            (总记录数, 检查名 -> 命中记录数)
+        """
+        if not self._watermark_enabled:
+            return self._count_matching_rows(db, 'daily_data', checks)
+        
+        with db.transaction():
+            total_records, max_id = db.execute_query(_DAILY_DATA_EXTENT_SQL)[0]
+            last_id = db.get_config(_DAILY_DATA_WATERMARK_KEY)
+            snapshot = loads(db.get_config(_DAILY_DATA_SNAPSHOT_KEY, 'null'))
+            
+            # 检查项变化后上次的结果不能复用
+            if last_id is not None and snapshot and snapshot['checks'] == [list(check) for check in checks]:
+                delta_total, delta_counts = self._count_matching_rows(
+                    db, 'daily_data', checks, 'id > ? AND id <= ?', (last_id, max_id)
+                )
+                if snapshot['total_records'] + delta_total == total_records:
+                    counts = {name: snapshot['counts'][name] + delta_counts[name] for name, _ in checks}
+                    self._save_daily_data_watermark(db, max_id, checks, total_records, counts)
+                    return total_records, counts
+                
+                self.logger.info("日线数据在上次检查后有删除，重新全表统计")
+            
+            total_records, counts = self._count_matching_rows(
+                db, 'daily_data', checks, 'id <= ?', (max_id,)
+            )
+            self._save_daily_data_watermark(db, max_id, checks, total_records, counts)
+            return total_records, counts
+    
+    def _save_daily_data_watermark(self, db: DatabaseManager, max_id: int,
+                                   checks: List[Tuple[str, str]], total_records: int,
+                                   counts: Dict[str, int]):
+        """保存日线数据增量检查的水位及统计结果"""
+        snapshot = {
+            'checks': [list(check) for check in checks],
+            'total_records': total_records,
+            'counts': counts
+        }
+        with db.transaction():
+            db.set_config(_DAILY_DATA_SNAPSHOT_KEY, dumps(snapshot),
+                          '日线数据完整性检查结果快照')
+            db.set_config(_DAILY_DATA_WATERMARK_KEY, max_id, '日线数据完整性检查水位（最大id）')
+    
+    def _check_relationship_integrity(self, db: DatabaseManager) -> Dict[str, Any]:
         """检查表之间的关联完整性"""
         results = {}
         
+        # 以 NOT EXISTS 反连接判断关联记录是否存在，按索引逐条查找；
+        # 与 NOT IN 不同，子查询结果含NULL时不会使整个条件失效。
+        # 代码为空的记录不算孤立记录，由空值检查负责
         try:
             # 检查日线数据表中的股票代码是否都存在于股票基本信息表中
-            orphan_query = """
-            SELECT COUNT(DISTINCT ts_code)
-            FROM daily_data
-            WHERE ts_code NOT IN (SELECT ts_code FROM stocks)
-            """
-            result = self.db_manager.execute_query(orphan_query)
+            result = db.execute_query(_ORPHAN_DAILY_DATA_SQL)
             results['orphan_daily_data'] = result[0][0] if result else 0
             
             # 检查股票基本信息表中哪些股票没有日线数据
-            missing_data_query = """
-            SELECT COUNT(*)
-            FROM stocks
-            WHERE ts_code NOT IN (SELECT DISTINCT ts_code FROM daily_data)
-            """
-            result = self.db_manager.execute_query(missing_data_query)
+            result = db.execute_query(_STOCKS_WITHOUT_DATA_SQL)
             results['stocks_without_data'] = result[0][0] if result else 0
             
             # 检查下载状态表与股票基本信息表的关联
-            status_orphan_query = """
-            SELECT COUNT(*)
-            FROM download_status
-            WHERE ts_code NOT IN (SELECT ts_code FROM stocks)
-            """
-            result = self.db_manager.execute_query(status_orphan_query)
+            result = db.execute_query(_ORPHAN_DOWNLOAD_STATUS_SQL)
             results['orphan_download_status'] = result[0][0] if result else 0
             
             return results
             
         except Exception as e:
-            self.logger.error(f"检查关联完整性失败: {e}")
+            self.logger.error("检查关联完整性失败: %s", e)
             return {'error': str(e)}
     
-    def _check_logical_consistency(self) -> Dict[str, Any]:
+    def _check_logical_consistency(self, db: DatabaseManager) -> Dict[str, Any]:
         """检查数据逻辑一致性"""
         results = {}
         
@@ -539,31 +825,21 @@ class DataIntegrityManager:
             JOIN stocks s ON dd.ts_code = s.ts_code
             WHERE dd.trade_date < s.list_date
             """
-            result = self.db_manager.execute_query(early_data_query)
+            result = db.execute_query(early_data_query)
             results['data_before_listing'] = result[0][0] if result else 0
             
-            # 检查未来日期的数据
-            future_data_query = """
-            SELECT COUNT(*)
-            FROM daily_data
-            WHERE trade_date > date('now')
-            """
-            result = self.db_manager.execute_query(future_data_query)
-            results['future_data'] = result[0][0] if result else 0
-            
-            # 检查非工作日的数据（简单检查周六周日）
-            weekend_query = """
-            SELECT COUNT(*)
-            FROM daily_data
-            WHERE strftime('%w', trade_date) IN ('0', '6')
-            """
-            result = self.db_manager.execute_query(weekend_query)
-            results['weekend_data'] = result[0][0] if result else 0
+            # 检查未来日期的数据，以及非工作日的数据（简单检查周六周日）
+            # 星期几需逐行计算，无法走索引，两项检查合并为一次全表扫描
+            _, counts = self._count_matching_rows(db, 'daily_data', [
+                ('future_data', "trade_date > date('now')"),
+                ('weekend_data', "strftime('%w', trade_date) IN ('0', '6')")
+            ])
+            results.update(counts)
             
             return results
             
         except Exception as e:
-            self.logger.error(f"检查逻辑一致性失败: {e}")
+            self.logger.error("检查逻辑一致性失败: %s", e)
             return {'error': str(e)}
     
     def repair_data_integrity(self, repair_types: List[str] = None) -> Dict[str, Any]:
@@ -601,7 +877,7 @@ class DataIntegrityManager:
             }
             
         except Exception as e:
-            self.logger.error(f"数据完整性修复失败: {e}")
+            self.logger.error("数据完整性修复失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -617,10 +893,12 @@ class DataIntegrityManager:
                 "DELETE FROM stocks WHERE ts_code IS NULL OR ts_code = ''"
             ]
             
+            # 所有删除在同一事务中执行，只提交一次
             total_deleted = 0
-            for query in queries:
-                deleted = self.db_manager.execute_update(query)
-                total_deleted += deleted
+            with self.db_manager.transaction():
+                for query in queries:
+                    deleted = self.db_manager.execute_update(query)
+                    total_deleted += deleted
             
             return {
                 'success': True,
@@ -628,7 +906,7 @@ class DataIntegrityManager:
             }
             
         except Exception as e:
-            self.logger.error(f"修复空值失败: {e}")
+            self.logger.error("修复空值失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -637,21 +915,23 @@ class DataIntegrityManager:
     def _repair_invalid_prices(self) -> Dict[str, Any]:
         """修复无效价格数据"""
         try:
-            # 删除负价格记录
-            query = """
-            DELETE FROM daily_data 
-            WHERE open < 0 OR high < 0 OR low < 0 OR close < 0
-            """
-            
-            deleted_negative = self.db_manager.execute_update(query)
-            
-            # 删除逻辑错误的价格记录
-            query = """
-            DELETE FROM daily_data 
-            WHERE high < low OR open < low OR open > high OR close < low OR close > high
-            """
-            
-            deleted_logic = self.db_manager.execute_update(query)
+            # 两个删除在同一事务中执行，只提交一次
+            with self.db_manager.transaction():
+                # 删除负价格记录
+                query = """
+                DELETE FROM daily_data 
+                WHERE open < 0 OR high < 0 OR low < 0 OR close < 0
+                """
+                
+                deleted_negative = self.db_manager.execute_update(query)
+                
+                # 删除逻辑错误的价格记录
+                query = """
+                DELETE FROM daily_data 
+                WHERE high < low OR open < low OR open > high OR close < low OR close > high
+                """
+                
+                deleted_logic = self.db_manager.execute_update(query)
             
             return {
                 'success': True,
@@ -661,7 +941,7 @@ class DataIntegrityManager:
             }
             
         except Exception as e:
-            self.logger.error(f"修复无效价格失败: {e}")
+            self.logger.error("修复无效价格失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -670,21 +950,25 @@ class DataIntegrityManager:
     def _repair_orphan_records(self) -> Dict[str, Any]:
         """修复孤立记录"""
         try:
-            # 删除日线数据表中不存在对应股票基本信息的记录
-            query = """
-            DELETE FROM daily_data
-            WHERE ts_code NOT IN (SELECT ts_code FROM stocks)
-            """
-            
-            deleted_orphan_daily = self.db_manager.execute_update(query)
-            
-            # 删除下载状态表中不存在对应股票基本信息的记录
-            query = """
-            DELETE FROM download_status
-            WHERE ts_code NOT IN (SELECT ts_code FROM stocks)
-            """
-            
-            deleted_orphan_status = self.db_manager.execute_update(query)
+            # 两个删除在同一事务中执行，只提交一次
+            with self.db_manager.transaction():
+                # 删除日线数据表中不存在对应股票基本信息的记录
+                query = """
+                DELETE FROM daily_data
+                WHERE ts_code IS NOT NULL
+                AND NOT EXISTS (SELECT 1 FROM stocks s WHERE s.ts_code = daily_data.ts_code)
+                """
+                
+                deleted_orphan_daily = self.db_manager.execute_update(query)
+                
+                # 删除下载状态表中不存在对应股票基本信息的记录
+                query = """
+                DELETE FROM download_status
+                WHERE ts_code IS NOT NULL
+                AND NOT EXISTS (SELECT 1 FROM stocks s WHERE s.ts_code = download_status.ts_code)
+                """
+                
+                deleted_orphan_status = self.db_manager.execute_update(query)
             
             return {
                 'success': True,
@@ -694,7 +978,7 @@ class DataIntegrityManager:
             }
             
         except Exception as e:
-            self.logger.error(f"修复孤立记录失败: {e}")
+            self.logger.error("修复孤立记录失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -703,6 +987,9 @@ class DataIntegrityManager:
     def generate_integrity_report(self, output_file: str = None) -> Dict[str, Any]:
         """生成完整性检查报告
         
+        指定输出文件时，重复记录详情从数据库游标流式写入文件，
+        返回的报告中只保留各表的重复分组数量。
+        
         Args:
             output_file: 输出文件路径
             
@@ -719,7 +1006,10 @@ class DataIntegrityManager:
             # 检查重复记录
             duplicate_results = {}
             for table in ['daily_data', 'stocks']:
-                duplicate_results[table] = self.check_duplicate_records(table)
+                if output_file:
+                    duplicate_results[table] = self._count_duplicate_groups(table)
+                else:
+                    duplicate_results[table] = self.check_duplicate_records(table)
             
             # 生成报告
             report = {
@@ -734,10 +1024,23 @@ class DataIntegrityManager:
                 output_path = Path(output_file)
                 output_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(report, f, ensure_ascii=False, indent=2)
+                # 重复记录详情以生成器形式放入报告，写文件时逐组取出
+                duplicate_check = {
+                    table: dict(result, duplicates=self._iter_duplicates(table) if result['success'] else iter(()))
+                    for table, result in duplicate_results.items()
+                }
+                
+                # 先写临时文件再原子替换，流式写出中途失败不会留下截断的报告
+                tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+                try:
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        _write_json(f, dict(report, duplicate_check=duplicate_check))
+                    os.replace(tmp_path, output_path)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
                 
-                self.logger.info(f"完整性检查报告已保存到: {output_path}")
+                self.logger.info("完整性检查报告已保存到: %s", output_path)
             
             return {
                 'success': True,
@@ -746,7 +1049,7 @@ class DataIntegrityManager:
             }
             
         except Exception as e:
-            self.logger.error(f"生成完整性报告失败: {e}")
+            self.logger.error("生成完整性报告失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -842,28 +1145,34 @@ def main():
     
     args = parser.parse_args()
     
+    # 设置日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # 创建管理器
     manager = DataIntegrityManager()
     
     if args.check_duplicates:
         result = manager.check_duplicate_records(args.check_duplicates)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     
     elif args.remove_duplicates:
         result = manager.remove_duplicate_records(args.remove_duplicates, args.strategy)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     
     elif args.check_integrity:
         result = manager.check_data_integrity()
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     
     elif args.repair_data is not None:
         result = manager.repair_data_integrity(args.repair_data)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     
     elif args.generate_report:
         result = manager.generate_integrity_report(args.generate_report)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     
     else:
         parser.print_help()
@@ -23,6 +23,13 @@ from .database_manager import DatabaseManager
 from .stock_basic_manager import StockBasicManager
 
 
+# daily_data 表的写入列
+_DAILY_DATA_COLUMNS = (
+    'ts_code', 'trade_date', 'open', 'high', 'low', 'close', 'pre_close',
+    'change', 'pct_chg', 'vol', 'amount'
+)
+
+
 class DataStorageManager:
     """数据存储和查询管理器"""
     
@@ -248,23 +255,13 @@ class DataStorageManager:
             if daily_data.empty:
                 return {'inserted': 0, 'updated': 0, 'duplicates': 0, 'errors': 0}
             
-            # 转换为字典列表
-            data_list = []
-            for _, row in daily_data.iterrows():
-                data_dict = {
-                    'ts_code': row['ts_code'],
-                    'trade_date': row['trade_date'],
-                    'open': row.get('open'),
-                    'high': row.get('high'),
-                    'low': row.get('low'),
-                    'close': row.get('close'),
-                    'pre_close': row.get('pre_close'),
-                    'change': row.get('change'),
-                    'pct_chg': row.get('pct_chg'),
-                    'vol': row.get('vol'),
-                    'amount': row.get('amount')
-                }
-                data_list.append(data_dict)
+            # 转换为字典列表：缺失的列补为空值，按元组逐行构造，避免 iterrows 为每行创建 Series
+            frame = daily_data.reindex(columns=_DAILY_DATA_COLUMNS)
+            frame = frame.astype(object).where(frame.notna(), None)
+            data_list = [
+                dict(zip(_DAILY_DATA_COLUMNS, row))
+                for row in frame.itertuples(index=False, name=None)
+            ]
             
             # 批量插入或更新
             affected_rows = self.db_manager.bulk_insert_or_update(
@@ -9,23 +9,37 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterator
 from datetime import datetime
 import json
+from contextlib import contextmanager
+
+
+# PRAGMA synchronous 允许的取值
+_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
 
 
 class DatabaseManager:
     """数据库管理器类"""
     
-    def __init__(self, db_path: str = "data/stock_data.db"):
+    def __init__(self, db_path: str = "data/stock_data.db", synchronous: str = "NORMAL"):
         """
         初始化数据库管理器
         
         Args:
             db_path: 数据库文件路径
+            synchronous: PRAGMA synchronous 模式。WAL 模式下 NORMAL 不会损坏数据库，
+                但系统断电时可能丢失最近提交的事务；需要每次提交都落盘时使用 FULL
         """
+        synchronous = str(synchronous).upper()
+        if synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(f"不支持的 synchronous 模式: {synchronous}")
+        
         self.db_path = db_path
+        self.synchronous = synchronous
         self.connection: Optional[sqlite3.Connection] = None
+        # transaction() 的嵌套层数，大于0时各 execute_* 方法不单独提交
+        self._transaction_depth = 0
         self.logger = logging.getLogger(__name__)
         
         # 确保数据目录存在
@@ -68,7 +82,13 @@ class DatabaseManager:
             # 设置WAL模式以提高并发性能
             self.connection.execute("PRAGMA journal_mode = WAL")
             
-            self.logger.info(f"数据库连接成功: {self.db_path}")
+            # 写入性能相关设置：提交时的同步级别、临时表放内存、64MB页缓存、256MB内存映射
+            self.connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+            self.connection.execute("PRAGMA temp_store = MEMORY")
+            self.connection.execute("PRAGMA cache_size = -65536")
+            self.connection.execute("PRAGMA mmap_size = 268435456")
+            
+            self.logger.debug(f"数据库连接成功: {self.db_path}")
             return self.connection
             
         except sqlite3.Error as e:
@@ -80,7 +100,7 @@ class DatabaseManager:
         if self.connection:
             self.connection.close()
             self.connection = None
-            self.logger.info("数据库连接已关闭")
+            self.logger.debug("数据库连接已关闭")
     
     def __enter__(self):
         """上下文管理器入口"""
@@ -187,6 +207,43 @@ class DatabaseManager:
             self.logger.error(f"查询执行失败: {e}")
             raise
     
+    def iter_query(self, query: str, params: tuple = None,
+                   arraysize: int = 1000) -> Iterator[sqlite3.Row]:
+        """
+        流式执行查询语句
+        
+        按 arraysize 分批从游标取行并逐行产出，内存占用与结果集大小无关，
+        适合结果可能很大且只需顺序消费的查询。
+        
+        Args:
+            query: SQL查询语句
+            params: 查询参数
+            arraysize: 每批从游标取出的行数
+            
+        Returns:
+            Iterator[sqlite3.Row]: 查询结果迭代器
+        """
+        try:
+            if not self.connection:
+                self.connect()
+            
+            cursor = self.connection.cursor()
+            cursor.arraysize = arraysize
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"查询执行失败: {e}")
+            raise
+    
     def execute_insert(self, query: str, params: tuple = None) -> int:
         """
         执行插入语句
@@ -208,13 +265,12 @@ class DatabaseManager:
             else:
                 cursor.execute(query)
             
-            self.connection.commit()
+            self._commit()
             return cursor.lastrowid
             
         except sqlite3.Error as e:
             self.logger.error(f"插入执行失败: {e}")
-            if self.connection:
-                self.connection.rollback()
+            self._rollback()
             raise
     
     def execute_batch_insert(self, query: str, data: List[tuple]) -> int:
@@ -235,13 +291,12 @@ class DatabaseManager:
             cursor = self.connection.cursor()
             cursor.executemany(query, data)
             
-            self.connection.commit()
+            self._commit()
             return cursor.rowcount
             
         except sqlite3.Error as e:
             self.logger.error(f"批量插入失败: {e}")
-            if self.connection:
-                self.connection.rollback()
+            self._rollback()
             raise
     
     def execute_update(self, query: str, params: tuple = None) -> int:
@@ -265,13 +320,12 @@ class DatabaseManager:
             else:
                 cursor.execute(query)
             
-            self.connection.commit()
+            self._commit()
             return cursor.rowcount
             
         except sqlite3.Error as e:
             self.logger.error(f"更新执行失败: {e}")
-            if self.connection:
-                self.connection.rollback()
+            self._rollback()
             raise
     
     def execute_delete(self, query: str, params: tuple = None) -> int:
@@ -295,15 +349,63 @@ class DatabaseManager:
             else:
                 cursor.execute(query)
             
-            self.connection.commit()
+            self._commit()
             return cursor.rowcount
             
         except sqlite3.Error as e:
             self.logger.error(f"删除执行失败: {e}")
-            if self.connection:
-                self.connection.rollback()
+            self._rollback()
             raise
     
+    def _commit(self):
+        """提交当前事务；处于 transaction() 中时由其统一提交"""
+        if not self._transaction_depth:
+            self.connection.commit()
+    
+    def _rollback(self):
+        """
+        回滚当前事务；处于 transaction() 中时由其统一回滚
+        
+        出错的语句本身已由 SQLite 撤销。在事务中回滚会连带撤销之前的写入，
+        而捕获了异常的调用方会在新的隐式事务中继续写入，最终被外层提交。
+        """
+        if self.connection and not self._transaction_depth:
+            self.connection.rollback()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        在同一事务中执行多条写操作，全部成功后只提交一次，出错时整体回滚
+        
+        事务内调用 execute_update 等方法不会各自提交；支持嵌套，
+        只有最外层负责提交或回滚。
+        
+        Yields:
+            sqlite3.Connection: 数据库连接对象
+        """
+        if not self.connection:
+            self.connect()
+        
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self.connection
+            finally:
+                self._transaction_depth -= 1
+            return
+        
+        self.connection.execute("BEGIN IMMEDIATE")
+        self._transaction_depth = 1
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.rollback()
+            raise
+        else:
+            self.connection.commit()
+        finally:
+            self._transaction_depth = 0
+    
     def execute_transaction(self, operations: List[Dict[str, Any]]) -> bool:
         """
         执行事务操作
@@ -375,14 +477,13 @@ class DatabaseManager:
             
             cursor = self.connection.cursor()
             cursor.execute(sql, values)
-            self.connection.commit()
+            self._commit()
             
             return cursor.rowcount
             
         except sqlite3.Error as e:
             self.logger.error(f"插入或更新失败: {e}")
-            if self.connection:
-                self.connection.rollback()
+            self._rollback()
             raise
     
     def bulk_insert_or_update(self, table: str, data_list: List[Dict[str, Any]], conflict_columns: List[str]) -> int:
@@ -424,14 +525,13 @@ class DatabaseManager:
             
             cursor = self.connection.cursor()
             cursor.executemany(sql, values_list)
-            self.connection.commit()
+            self._commit()
             
             return cursor.rowcount
             
         except sqlite3.Error as e:
             self.logger.error(f"批量插入或更新失败: {e}")
-            if self.connection:
-                self.connection.rollback()
+            self._rollback()
             raise
     
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
@@ -533,6 +633,62 @@ class DatabaseManager:
             self.logger.error(f"获取表统计失败: {e}")
             raise
     
+    def get_table_statistics_batch(self, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取多张表的记录数与占用空间
+        
+        所有表的记录数通过一条 UNION ALL 查询取得，占用空间通过一次 dbstat 查询取得，
+        不存在的表记为 0。
+        
+        Args:
+            table_names: 表名列表
+            
+        Returns:
+            Dict: {表名: {'count': 记录数, 'size_mb': 占用空间MB}}
+        """
+        stats = {table: {'count': 0, 'size_mb': 0} for table in table_names}
+        if not table_names:
+            return stats
+        
+        try:
+            if not self.connection:
+                self.connect()
+            
+            cursor = self.connection.cursor()
+            placeholders = ','.join('?' * len(table_names))
+            
+            cursor.execute(
+                f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+                tuple(table_names)
+            )
+            existing = [row[0] for row in cursor.fetchall()]
+            
+            if existing:
+                union_sql = " UNION ALL ".join(
+                    f"SELECT '{table}', COUNT(*) FROM {table}" for table in existing
+                )
+                cursor.execute(union_sql)
+                for table, count in cursor.fetchall():
+                    stats[table]['count'] = count
+                
+                # dbstat 虚拟表需要 SQLite 编译时启用，不可用时保留 0
+                try:
+                    cursor.execute(
+                        f"SELECT name, SUM(pgsize) FROM dbstat "
+                        f"WHERE name IN ({','.join('?' * len(existing))}) GROUP BY name",
+                        tuple(existing)
+                    )
+                    for table, size in cursor.fetchall():
+                        stats[table]['size_mb'] = round((size or 0) / (1024 * 1024), 2)
+                except sqlite3.OperationalError:
+                    pass
+            
+            return stats
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"批量获取表统计失败: {e}")
+            raise
+    
     def vacuum_database(self) -> bool:
         """
         执行数据库清理和优化
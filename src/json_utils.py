@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+JSON 序列化工具
+安装了 orjson 时使用其C实现，否则回退到标准库 json
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时使用标准库 json
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTION = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+@lru_cache(maxsize=None)
+def _encoder(indent: int) -> json.JSONEncoder:
+    """标准库回退路径共用的编码器，按缩进缓存，避免每次序列化都重新构造"""
+    return json.JSONEncoder(indent=indent, ensure_ascii=False)
+
+
+def dumps(value: Any, indent: int = 2) -> str:
+    """序列化为JSON字符串（中文不转义）
+
+    orjson 只支持两空格缩进，其他缩进走标准库 json。
+
+    Args:
+        value: 待序列化的值
+        indent: 缩进空格数
+
+    Returns:
+        JSON字符串
+    """
+    if orjson is not None and indent == 2:
+        return orjson.dumps(value, option=_ORJSON_OPTION).decode('utf-8')
+    return _encoder(indent).encode(value)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析JSON字节串或字符串"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -20,6 +20,7 @@ import time
 
 from .config_manager import ConfigManager
 from .database_manager import DatabaseManager
+from .cli_choices import LOG_TYPES
 
 
 class LogLevel(Enum):
@@ -41,6 +42,10 @@ class LogType(Enum):
     PERFORMANCE = 'performance'  # 性能日志
 
 
+# 命令行参数选项单独维护，在此检查是否与枚举一致
+assert tuple(t.value for t in LogType) == LOG_TYPES, "cli_choices.LOG_TYPES 与 LogType 不一致"
+
+
 class LoggingManager:
     """日志记录管理器
     
@@ -57,18 +62,26 @@ class LoggingManager:
             config_manager = ConfigManager()
         
         self.config = config_manager
+        # 一次取出初始化所需的全部配置项
+        settings = self.config.get_many({
+            'database.path': 'data/stock_data.db',
+            'logging.file_path': 'logs/stock_downloader.log',
+            'logging.level': 'INFO',
+            'logging.max_file_size': '10MB',
+            'logging.backup_count': 5,
+            'logging.format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        })
+        
         # 从配置管理器获取数据库路径
-        db_path = self.config.get('database.path', 'data/stock_data.db')
-        self.db_manager = DatabaseManager(db_path)
+        self.db_manager = DatabaseManager(settings['database.path'])
         
         # 日志配置
         self.log_config = {
-            'log_dir': Path(self.config.get('logging.file_path', 'logs/stock_downloader.log')).parent,
-            'log_level': self.config.get('logging.level', 'INFO'),
-            'max_file_size': self._parse_size(self.config.get('logging.max_file_size', '10MB')),
-            'backup_count': self.config.get('logging.backup_count', 5),
-            'log_format': self.config.get('logging.format', 
-                                        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+            'log_dir': Path(settings['logging.file_path']).parent,
+            'log_level': settings['logging.level'],
+            'max_file_size': self._parse_size(settings['logging.max_file_size']),
+            'backup_count': settings['logging.backup_count'],
+            'log_format': settings['logging.format'],
             'enable_console': True,
             'enable_file': True,
             'enable_database': True
@@ -9,6 +9,7 @@ import tushare as ts
 import pandas as pd
 import time
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 import json
@@ -44,6 +45,8 @@ class OptimizedTushareAPIManager:
         self.call_count_today = 0
         self.last_call_time = None
         self.calls_this_minute = []
+        # 保护调用计数，多线程下载时检查与登记需原子完成
+        self._rate_lock = threading.Lock()
         
         # 限制配置
         self.max_calls_per_minute = 2
@@ -56,6 +59,8 @@ class OptimizedTushareAPIManager:
         
         # 内置交易日历（2024-2025年）
         self._init_trade_calendar()
+        # 按年份缓存的交易日集合，is_trade_date 直接做集合查找
+        self._trade_dates_by_year: Dict[str, frozenset] = {}
         
         self.logger.info("优化版TushareAPIManager初始化完成")
     
@@ -119,16 +124,49 @@ class OptimizedTushareAPIManager:
         Returns:
             True表示交易日，False表示非交易日
         """
-        # 检查是否在节假日列表中
-        if date_str in self.trade_calendar:
-            return self.trade_calendar[date_str]
+        return date_str in self._get_year_trade_dates(date_str[:4])
+    
+    def _get_year_trade_dates(self, year: str) -> frozenset:
+        """获取指定年份的全部交易日集合
         
-        # 检查是否为周末
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        weekday = date_obj.weekday()
+        每个年份只按交易日历计算一次，之后直接从缓存返回。
         
-        # 0-4为周一到周五（交易日），5-6为周六周日（非交易日）
-        return weekday < 5
+        Args:
+            year: 四位年份字符串
+            
+        Returns:
+            该年份交易日（YYYY-MM-DD）的集合
+        """
+        dates = self._trade_dates_by_year.get(year)
+        if dates is None:
+            dates = frozenset(self.get_trade_dates(f"{year}-01-01", f"{year}-12-31"))
+            self._trade_dates_by_year[year] = dates
+        return dates
+    
+    def get_trade_dates(self, start_date: str, end_date: str) -> List[str]:
+        """获取日期范围内的交易日列表
+        
+        一次生成整个范围的日期并按星期批量判断，结果与逐日调用 is_trade_date 相同。
+        
+        Args:
+            start_date: 开始日期，格式YYYY-MM-DD或YYYYMMDD
+            end_date: 结束日期，格式YYYY-MM-DD或YYYYMMDD
+            
+        Returns:
+            交易日期列表（升序），格式YYYY-MM-DD
+        """
+        days = pd.date_range(start_date, end_date, freq='D')
+        if days.empty:
+            return []
+        
+        is_weekday = days.weekday < 5
+        calendar = self.trade_calendar
+        
+        return [
+            date_str
+            for date_str, weekday in zip(days.strftime('%Y-%m-%d'), is_weekday)
+            if calendar.get(date_str, weekday)
+        ]
     
     def get_recent_trade_dates(self, days: int = 10) -> List[str]:
         """获取最近的交易日列表
@@ -188,8 +226,15 @@ class OptimizedTushareAPIManager:
         return True
     
     def _wait_for_rate_limit(self):
-        """等待直到可以进行API调用"""
-        while not self._rate_limit_check():
+        """等待直到可以进行API调用，并登记本次调用
+        
+        检查与登记在同一把锁内完成，多个线程不会同时占用同一个调用名额。
+        """
+        while True:
+            with self._rate_lock:
+                if self._rate_limit_check():
+                    self._record_api_call()
+                    return
             time.sleep(5)  # 等待5秒后重新检查
     
     def _record_api_call(self):
@@ -241,6 +286,7 @@ class OptimizedTushareAPIManager:
         
         # API调用
         try:
+            # 等待频率限制（同时登记本次调用）
             self._wait_for_rate_limit()
             
             self.logger.info(f"开始获取 {trade_date} 的日线数据...")
@@ -255,8 +301,6 @@ class OptimizedTushareAPIManager:
                 # 获取所有股票的数据
                 df = self.pro.daily(trade_date=api_date)
             
-            self._record_api_call()
-            
             end_time = datetime.now()
             response_time = (end_time - start_time).total_seconds()
             
@@ -412,7 +456,7 @@ class OptimizedTushareAPIManager:
             if is_hs:
                 params['is_hs'] = is_hs
             
-            # 等待频率限制
+            # 等待频率限制（同时登记本次调用）
             self._wait_for_rate_limit()
             
             # 调用API
@@ -420,9 +464,6 @@ class OptimizedTushareAPIManager:
             result = self.pro.stock_basic(**params)
             response_time = int((time.time() - start_time) * 1000)
             
-            # 记录API调用
-            self._record_api_call()
-            
             if result is not None and not result.empty:
                 print(f"✅ 成功获取 {len(result)} 条股票基本信息")
                 
@@ -23,6 +23,7 @@ from .error_handler_retry_manager import ErrorHandlerRetryManager, ErrorType
 from .download_status_manager import DownloadStatusManager
 from .data_integrity_manager import DataIntegrityManager
 from .optimized_tushare_api_manager import OptimizedTushareAPIManager
+from .cli_choices import TASK_TYPES
 
 
 class ScheduleStatus(Enum):
@@ -42,6 +43,10 @@ class TaskType(Enum):
     STATUS_UPDATE = "status_update"
 
 
+# 命令行参数选项单独维护，在此检查是否与枚举一致
+assert tuple(t.value for t in TaskType) == TASK_TYPES, "cli_choices.TASK_TYPES 与 TaskType 不一致"
+
+
 class ScheduleManager:
     """定时任务调度管理器"""
     
@@ -696,32 +701,71 @@ class ScheduleManager:
         
         return next_runs
     
-    def get_task_history(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """获取任务历史"""
+    def get_task_history(self, limit: int = 100, task_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        获取任务历史
+        
+        Args:
+            limit: 返回的最大条数
+            task_type: 只返回指定类型的任务，None表示全部
+        """
+        if task_type:
+            results = self.db_manager.execute_query(
+                """
+                SELECT task_type, task_name, start_time, end_time, status, 
+                       execution_time_seconds, error_message
+                FROM schedule_tasks 
+                WHERE task_type = ?
+                ORDER BY start_time DESC 
+                LIMIT ?
+                """,
+                (task_type, limit)
+            )
+        else:
+            results = self.db_manager.execute_query(
+                """
+                SELECT task_type, task_name, start_time, end_time, status, 
+                       execution_time_seconds, error_message
+                FROM schedule_tasks 
+                ORDER BY start_time DESC 
+                LIMIT ?
+                """,
+                (limit,)
+            )
+        
+        return [self._row_to_task(row) for row in results]
+    
+    def get_latest_task(self) -> Optional[Dict[str, Any]]:
+        """
+        获取最近一次执行的任务
+        
+        Returns:
+            任务信息字典，没有任务记录时返回None
+        """
         results = self.db_manager.execute_query(
             """
             SELECT task_type, task_name, start_time, end_time, status, 
                    execution_time_seconds, error_message
             FROM schedule_tasks 
             ORDER BY start_time DESC 
-            LIMIT ?
-            """,
-            (limit,)
+            LIMIT 1
+            """
         )
         
-        history = []
-        for row in results:
-            history.append({
-                "task_type": row[0],
-                "task_name": row[1],
-                "start_time": row[2],
-                "end_time": row[3],
-                "status": row[4],
-                "execution_time": row[5],
-                "error_message": row[6]
-            })
-        
-        return history
+        return self._row_to_task(results[0]) if results else None
+    
+    @staticmethod
+    def _row_to_task(row) -> Dict[str, Any]:
+        """将 schedule_tasks 查询行转换为任务信息字典"""
+        return {
+            "task_type": row[0],
+            "task_name": row[1],
+            "start_time": row[2],
+            "end_time": row[3],
+            "status": row[4],
+            "execution_time": row[5],
+            "error_message": row[6]
+        }
     
     def update_task_config(self, task_type: TaskType, config: Dict[str, Any]):
         """更新任务配置"""
@@ -58,12 +58,15 @@ class SmartDownloadManager:
         )
         
         # 下载策略配置
+        download_settings = self.config.get_many({
+            'download.batch_size': 100,
+            'download.max_workers': 1,
+            'download.enable_incremental': True,
+            'download.auto_retry': True,
+            'download.max_retry_attempts': 3
+        })
         self.download_config = {
-            'batch_size': self.config.get('download.batch_size', 100),
-            'max_workers': self.config.get('download.max_workers', 1),
-            'enable_incremental': self.config.get('download.enable_incremental', True),
-            'auto_retry': self.config.get('download.auto_retry', True),
-            'max_retry_attempts': self.config.get('download.max_retry_attempts', 3)
+            key.split('.', 1)[1]: value for key, value in download_settings.items()
         }
     
     def analyze_download_requirements(self, 
@@ -19,11 +19,17 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import time
 import sqlite3
+import logging
+import threading
 
 from .database_manager import DatabaseManager
 from .optimized_tushare_api_manager import OptimizedTushareAPIManager
 
 
+# stock_basic 接口每日调用上限
+_STOCK_BASIC_DAILY_LIMIT = 5
+
+
 class StockBasicManager:
     """股票基本信息管理器"""
     
@@ -38,6 +44,7 @@ class StockBasicManager:
         db_path = config_manager.get('database_path', 'data/stock_data.db')
         self.db_manager = DatabaseManager(db_path)
         self.api_manager = OptimizedTushareAPIManager(config_manager)
+        self.logger = logging.getLogger(__name__)
         
         # 缓存配置
         self.cache_dir = Path(self.config.get('cache_path', 'data/cache'))
@@ -49,6 +56,10 @@ class StockBasicManager:
         # 缓存有效期（24小时）
         self.cache_validity_hours = 24
         
+        # 后台刷新线程（缓存过期时先返回旧数据，再异步刷新）
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        
         # 初始化统计信息
         self.stats = {
             'total_stocks': 0,
@@ -74,11 +85,19 @@ class StockBasicManager:
         print("=" * 60)
         
         # 检查缓存
-        if not force_update and self._is_cache_valid():
-            print("📋 使用本地缓存数据")
-            return self._load_from_cache()
+        if not force_update:
+            if self._is_cache_valid():
+                print("📋 使用本地缓存数据")
+                return self._load_from_cache()
+            
+            # 缓存已过期但存在：立即返回旧数据，后台刷新
+            if self._cache_exists():
+                print("📋 使用过期缓存数据，后台刷新中...")
+                stock_data = self._load_from_cache()
+                self._start_background_refresh()
+                return stock_data
         
-        # 缓存无效或强制更新，从API获取
+        # 无缓存或强制更新，同步从API获取
         print("🌐 从API获取股票基本信息...")
         stock_data = self._fetch_from_api()
         
@@ -127,6 +146,49 @@ class StockBasicManager:
             print(f"❌ 检查缓存失败: {e}")
             return False
     
+    def _start_background_refresh(self):
+        """启动后台刷新线程，同一时间只允许一个刷新任务"""
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            
+            # 守护线程不阻塞CLI退出；缓存文件原子替换、数据库写入在单个事务中，
+            # 进程中途退出时旧缓存和数据库都保持完整
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_cache,
+                name='stock-basic-refresh',
+                daemon=True
+            )
+            self._refresh_thread.start()
+    
+    def _refresh_cache(self):
+        """后台刷新缓存，失败时继续使用旧缓存
+        
+        使用独立的数据库连接，不与前台命令共用 self.db_manager；
+        结果只写日志，不打印到前台命令的输出中。
+        """
+        db_manager = DatabaseManager(self.db_manager.db_path, self.db_manager.synchronous)
+        try:
+            if self._api_call_count(db_manager) >= _STOCK_BASIC_DAILY_LIMIT:
+                self.logger.warning("stock_basic 接口今日调用次数已达上限，跳过后台刷新")
+                return
+            
+            stock_data = self.api_manager.get_stock_basic()
+            if stock_data is None or stock_data.empty:
+                self.logger.warning("后台刷新股票基本信息失败，继续使用旧缓存")
+                return
+            
+            self.stats['api_calls'] += 1
+            self._write_cache_files(stock_data)
+            db_manager.bulk_insert_or_update('stocks', self._to_stock_rows(stock_data), ['ts_code'])
+            self._update_stats(stock_data)
+            self.logger.info("后台刷新股票基本信息完成，共 %d 只股票", len(stock_data))
+            
+        except Exception as e:
+            self.logger.error("后台刷新股票基本信息异常: %s", e)
+        finally:
+            db_manager.disconnect()
+    
     def _cache_exists(self) -> bool:
         """检查缓存文件是否存在"""
         return self.cache_file.exists() and self.csv_cache_file.exists()
@@ -194,49 +256,64 @@ class StockBasicManager:
         """检查API调用限制"""
         # 从数据库检查今日API调用次数
         try:
-            conn = self.db_manager.connect()
-            cursor = conn.cursor()
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            query = """
-            SELECT COUNT(*) as call_count
-            FROM api_call_log 
-            WHERE api_name = 'stock_basic' 
-            AND date(call_time) = ?
-            AND success = 1
-            """
-            
-            cursor.execute(query, (today,))
-            result = cursor.fetchone()
-            call_count = result[0] if result else 0
+            call_count = self._api_call_count(self.db_manager)
             
             # stock_basic接口每日限制5次
-            if call_count >= 5:
-                print(f"⚠️  今日stock_basic接口调用次数已达上限: {call_count}/5")
+            if call_count >= _STOCK_BASIC_DAILY_LIMIT:
+                print(f"⚠️  今日stock_basic接口调用次数已达上限: {call_count}/{_STOCK_BASIC_DAILY_LIMIT}")
                 return False
             else:
-                print(f"✅ 今日stock_basic接口调用次数: {call_count}/5")
+                print(f"✅ 今日stock_basic接口调用次数: {call_count}/{_STOCK_BASIC_DAILY_LIMIT}")
                 return True
                     
         except Exception as e:
             print(f"❌ 检查API限制失败: {e}")
             return False
     
+    @staticmethod
+    def _api_call_count(db_manager: DatabaseManager) -> int:
+        """查询今日 stock_basic 接口的成功调用次数"""
+        conn = db_manager.connect()
+        cursor = conn.cursor()
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        query = """
+        SELECT COUNT(*) as call_count
+        FROM api_call_log 
+        WHERE api_name = 'stock_basic' 
+        AND date(call_time) = ?
+        AND success = 1
+        """
+        
+        cursor.execute(query, (today,))
+        result = cursor.fetchone()
+        return result[0] if result else 0
+    
+    def _write_cache_files(self, stock_data: pd.DataFrame):
+        """写入缓存数据和元数据文件
+        
+        先写临时文件再原子替换，中断时不会留下写了一半的缓存；
+        元数据最后替换，保证时间戳只在数据就绪后更新
+        """
+        cache_meta = {
+            'timestamp': datetime.now().isoformat(),
+            'record_count': len(stock_data),
+            'cache_version': '1.0'
+        }
+        
+        csv_tmp = self.csv_cache_file.with_suffix('.csv.tmp')
+        stock_data.to_csv(csv_tmp, index=False, encoding='utf-8')
+        os.replace(csv_tmp, self.csv_cache_file)
+        
+        meta_tmp = self.cache_file.with_suffix('.json.tmp')
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump(cache_meta, f, ensure_ascii=False, indent=2)
+        os.replace(meta_tmp, self.cache_file)
+    
     def _save_to_cache(self, stock_data: pd.DataFrame):
         """保存数据到缓存"""
         try:
-            # 保存元数据
-            cache_meta = {
-                'timestamp': datetime.now().isoformat(),
-                'record_count': len(stock_data),
-                'cache_version': '1.0'
-            }
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_meta, f, ensure_ascii=False, indent=2)
-            
-            # 保存CSV数据
-            stock_data.to_csv(self.csv_cache_file, index=False, encoding='utf-8')
+            self._write_cache_files(stock_data)
             
             print(f"💾 已保存 {len(stock_data)} 条记录到缓存")
             
@@ -246,28 +323,10 @@ class StockBasicManager:
     def _save_to_database(self, stock_data: pd.DataFrame):
         """保存数据到数据库"""
         try:
-            # 转换DataFrame为字典列表
-            data_list = []
-            for _, row in stock_data.iterrows():
-                data_dict = {
-                    'ts_code': row['ts_code'],
-                    'symbol': row['symbol'],
-                    'name': row['name'],
-                    'area': row.get('area'),
-                    'industry': row.get('industry'),
-                    'list_date': row.get('list_date'),
-                    'market': row.get('market'),
-                    'exchange': row.get('exchange'),
-                    'curr_type': row.get('curr_type'),
-                    'list_status': row.get('list_status'),
-                    'delist_date': row.get('delist_date')
-                }
-                data_list.append(data_dict)
-            
             # 使用bulk_insert_or_update方法处理数据
             affected_rows = self.db_manager.bulk_insert_or_update(
                 'stocks', 
-                data_list, 
+                self._to_stock_rows(stock_data), 
                 ['ts_code']  # 冲突检测列
             )
             
@@ -279,6 +338,27 @@ class StockBasicManager:
             import traceback
             print(f"详细错误: {traceback.format_exc()}")
     
+    @staticmethod
+    def _to_stock_rows(stock_data: pd.DataFrame) -> List[Dict]:
+        """将DataFrame转换为 stocks 表的字典列表"""
+        data_list = []
+        for _, row in stock_data.iterrows():
+            data_dict = {
+                'ts_code': row['ts_code'],
+                'symbol': row['symbol'],
+                'name': row['name'],
+                'area': row.get('area'),
+                'industry': row.get('industry'),
+                'list_date': row.get('list_date'),
+                'market': row.get('market'),
+                'exchange': row.get('exchange'),
+                'curr_type': row.get('curr_type'),
+                'list_status': row.get('list_status'),
+                'delist_date': row.get('delist_date')
+            }
+            data_list.append(data_dict)
+        return data_list
+    
     def _update_stats(self, stock_data: pd.DataFrame):
         """更新统计信息"""
         try:
@@ -0,0 +1,41 @@
+"""
+命令行界面测试：子命令预判与参数解析
+"""
+
+import pytest
+
+from src.command_line_interface import (
+    CommandLineInterface, _sniff_subcommand, _ALL_SUBCOMMANDS
+)
+
+
+@pytest.mark.parametrize('argv, expected', [
+    (['task', 'history'], 'task'),
+    (['--config', 'x.json', 'task', 'history'], 'task'),
+    (['-c', 'x.json', '-v', 'task', 'history'], 'task'),
+    (['--config=x.json', 'task', 'history'], 'task'),
+    (['--conf', 'x.json', 'task', 'history'], _ALL_SUBCOMMANDS),
+    (['-cx.json', 'task', 'history'], _ALL_SUBCOMMANDS),
+    (['--verbose'], None),
+    (['unknown'], None),
+])
+def test_sniff_subcommand(argv, expected):
+    assert _sniff_subcommand(argv) == expected
+
+
+@pytest.mark.parametrize('config_args', [
+    ['--config', 'x.json'],
+    ['--config=x.json'],
+    ['--conf', 'x.json'],
+    ['--conf=x.json'],
+    ['-c', 'x.json'],
+    ['-cx.json'],
+])
+def test_parse_config_forms(config_args):
+    argv = config_args + ['task', 'history', '--limit', '5']
+    args = CommandLineInterface()._get_parser(argv).parse_args(argv)
+
+    assert args.config == 'x.json'
+    assert args.command == 'task'
+    assert args.task_action == 'history'
+    assert args.limit == 5
@@ -138,7 +138,7 @@ def main():
         print("\n接下来的步骤:")
         print("1. 运行: python src/config_manager.py --setup")
         print("2. 运行: python src/database_manager.py --init")
-        print("3. 运行: python main.py")
+        print("3. 运行: stock-downloader --help")
     else:
         print("❌ 环境验证失败！请安装缺失的依赖。")
         print("\n修复方法:")